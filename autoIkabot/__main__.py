@@ -1,19 +1,21 @@
 """Allow running the package directly: python -m autoIkabot"""
 
-import multiprocessing
+import os
 import sys
-import pathlib
 
 
 def main():
     """Entry point for python -m autoIkabot and the console script."""
-    # Required for multiprocessing on Windows
-    multiprocessing.freeze_support()
+    # Required for multiprocessing in frozen Windows executables only;
+    # elsewhere it is a no-op, so don't import multiprocessing for it.
+    if sys.platform == "win32" and getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
 
     # Ensure the repo root is on sys.path so main can be found
-    repo_root = pathlib.Path(__file__).resolve().parent.parent
-    if str(repo_root) not in sys.path:
-        sys.path.insert(0, str(repo_root))
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
 
     from main import main as run_main
     run_main()
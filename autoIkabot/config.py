@@ -16,17 +16,22 @@ VERSION = "0.8.2"
 # Filesystem paths (all pathlib.Path, cross-platform)
 # ---------------------------------------------------------------------------
 
+# Paths are joined as strings and wrapped in a single Path() each — this
+# module is imported by every (spawned) process, so keep it cheap.
+
 # The root of the project is the parent of the autoIkabot/ package directory.
-PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+_PROJECT_ROOT_STR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATA_DIR_STR = os.path.join(_PROJECT_ROOT_STR, "autoIkabot", "data")
+PROJECT_ROOT = pathlib.Path(_PROJECT_ROOT_STR)
 
 # Runtime data directory (encrypted accounts file lives here)
-DATA_DIR = PROJECT_ROOT / "autoIkabot" / "data"
+DATA_DIR = pathlib.Path(_DATA_DIR_STR)
 
 # Debug log directory
-DEBUG_DIR = PROJECT_ROOT / "autoIkabot" / "debug"
+DEBUG_DIR = pathlib.Path(os.path.join(_PROJECT_ROOT_STR, "autoIkabot", "debug"))
 
 # Encrypted accounts file path
-ACCOUNTS_FILE = DATA_DIR / "accounts.enc"
+ACCOUNTS_FILE = pathlib.Path(os.path.join(_DATA_DIR_STR, "accounts.enc"))
 
 # ---------------------------------------------------------------------------
 # Logging constants
@@ -55,7 +60,7 @@ AES_NONCE_LEN = 12                 # 12-byte nonce for AES-256-GCM
 # ---------------------------------------------------------------------------
 # Docker / headless master key sources (checked in priority order)
 # ---------------------------------------------------------------------------
-DOCKER_SECRET_PATH = pathlib.Path("/run/secrets/autoikabot_key")
+# DOCKER_SECRET_PATH is built lazily — see __getattr__ at the end of the module
 MASTER_KEY_ENV_VAR = "AUTOIKABOT_MASTER_KEY"
 
 # ---------------------------------------------------------------------------
@@ -66,7 +71,12 @@ IS_WINDOWS = os.name == "nt"
 # ---------------------------------------------------------------------------
 # User-Agent pool (Phase 2.7)
 # ---------------------------------------------------------------------------
-USER_AGENTS_FILE = DATA_DIR / "user_agents.json"
+# USER_AGENTS_FILE is built lazily — see __getattr__ at the end of the module
+
+# Email -> user-agent hash. False keeps ikabot's sum-of-code-points hash so
+# existing accounts keep their user-agent; True uses CRC32, which spreads
+# similar emails more evenly over the pool (changes the UA for most users).
+UA_HASH_V2 = False
 
 # ---------------------------------------------------------------------------
 # URL constants (Phase 2) — all Gameforge endpoints used during login
@@ -94,6 +104,13 @@ CAPTCHA_IMAGE_BASE_URL = "https://image-drop-challenge.gameforge.com/challenge/{
 # ---------------------------------------------------------------------------
 PUBLIC_API_DOMAIN = "ikagod.twilightparadox.com"
 CUSTOM_API_ADDRESS_ENV = "CUSTOM_API_ADDRESS"
+# Internal: {domain: [address, resolved_at]} resolved by a parent process and
+# inherited by its children.  Not a user override; see CUSTOM_API_ADDRESS_ENV.
+RESOLVED_API_ADDRESS_ENV = "AUTOIKABOT_RESOLVED_API_ADDRESS"
+
+# Last resolved API address, shared across process launches
+API_ADDRESS_CACHE_FILE = pathlib.Path(os.path.join(_DATA_DIR_STR, "api_address.cache"))
+API_ADDRESS_CACHE_TTL = 60 * 60    # seconds — fresh window before re-resolving
 
 # ---------------------------------------------------------------------------
 # HTTP / Network constants (Phase 2)
@@ -101,6 +118,7 @@ CUSTOM_API_ADDRESS_ENV = "CUSTOM_API_ADDRESS"
 SSL_VERIFY = True
 REQUEST_TIMEOUT = 30               # seconds — normal requests
 CAPTCHA_TIMEOUT = 900              # seconds — captcha and token API calls
+CAPTCHA_API_COOLDOWN = 60          # seconds — skip captcha API after it fails
 CONNECTION_ERROR_WAIT = 5 * 60     # seconds — wait on connection failure
 LOGIN_MAX_RETRIES = 3              # retry count for login flow
 
@@ -129,6 +147,9 @@ ISLAND_URL = "view=island&islandId="
 # Rate limiting — minimum seconds between game requests (Phase 5.1)
 # Too fast triggers Ikariam's anti-bot detection / IP ban
 RATE_LIMIT_MIN_DELAY = 0.3         # seconds between requests (300ms)
+# Read-only page views fetched concurrently (each still honours the delay
+# above; overlapping them only hides the per-request round trip)
+GAME_FETCH_MAX_CONCURRENCY = 4
 
 # Technical resource names (lowercase, used in game HTML/JS — "glass" = Crystal)
 MATERIALS_NAMES_TEC = ["wood", "wine", "marble", "glass", "sulfur"]
@@ -169,3 +190,30 @@ SESSION_COOKIE_NAMES = [
     "cf_clearance",
     "__cf_bm",
 ]
+
+# ---------------------------------------------------------------------------
+# Lazily built constants (PEP 562)
+# ---------------------------------------------------------------------------
+# Paths only needed on rare code paths (headless key lookup, login
+# user-agent selection, recorded-input hand-off) are constructed on first
+# access and then cached as regular module globals, so importing config
+# stays cheap for every process.
+_LAZY = {
+    "DOCKER_SECRET_PATH": lambda: pathlib.Path("/run/secrets/autoikabot_key"),
+    "USER_AGENTS_FILE": lambda: pathlib.Path(os.path.join(_DATA_DIR_STR, "user_agents.json")),
+    # Temp file a recording child process hands its captured inputs back
+    # through (ui.prompts writes it, modules.autoLoader reads and removes it)
+    "RECORDED_INPUTS_FILE": lambda: os.path.join(
+        os.path.expanduser("~"), ".autoikabot_recorded_inputs.json"
+    ),
+}
+
+
+def __getattr__(name):
+    try:
+        factory = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = factory()
+    globals()[name] = value
+    return value
@@ -11,15 +11,36 @@ Resolver chain (in priority order):
 (Future resolvers: self-hosted API, notification/Telegram fallback, internal solver)
 """
 
-import requests as req_lib
+import sys
+import time
 
-from autoIkabot.config import CAPTCHA_TIMEOUT, SSL_VERIFY
-from autoIkabot.core.dns_resolver import get_api_address
-from autoIkabot.ui.prompts import read_choice
+from autoIkabot.config import CAPTCHA_API_COOLDOWN, CAPTCHA_TIMEOUT, SSL_VERIFY
 from autoIkabot.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# monotonic() deadline before which the captcha API is considered down.
+# Set on server errors / connection failures so repeated login attempts go
+# straight to the terminal prompt instead of hammering a dead API.
+_api_failure_until: float = 0.0
+
+# Lazily created pooled session so retries reuse the TCP/TLS connection.
+_session = None
+
+
+def _get_session():
+    """Return the module's shared requests.Session, creating it on first use."""
+    global _session
+    if _session is None:
+        import requests as req_lib
+        from requests.adapters import HTTPAdapter
+
+        _session = req_lib.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
 
 def _solve_via_api(text_image: bytes, icons_image: bytes) -> int:
     """Send captcha images to the third-party API for solving.
@@ -45,24 +66,51 @@ def _solve_via_api(text_image: bytes, icons_image: bytes) -> int:
     Exception
         On API failure or invalid response.
     """
+    global _api_failure_until
+
+    if time.monotonic() < _api_failure_until:
+        raise RuntimeError("Captcha API failed recently, skipping it for now")
+
+    # Deferred: the captcha path is rare, so don't pay for importing
+    # requests / the DNS resolver on every process start.
+    import requests as req_lib
+
+    from autoIkabot.core.dns_resolver import get_api_address
+
     address = get_api_address()
     url = f"{address}/v1/decaptcha/lobby"
     logger.info("Sending captcha to API for solving: %s", url)
 
-    files = {"text_image": text_image, "icons_image": icons_image}
-    response = req_lib.post(url, files=files, verify=SSL_VERIFY, timeout=CAPTCHA_TIMEOUT)
-
-    if response.status_code != 200:
-        raise RuntimeError(
-            f"Captcha API returned status {response.status_code}: {response.text}"
+    # Pass the bytes straight through as (filename, data, content-type):
+    # requests encodes the multipart body in memory either way, and wrapping
+    # in BytesIO would only add another read/copy.
+    files = {
+        "text_image": ("text_image", text_image, "image/png"),
+        "icons_image": ("icons_image", icons_image, "image/png"),
+    }
+    try:
+        response = _get_session().post(
+            url, files=files, verify=SSL_VERIFY, timeout=CAPTCHA_TIMEOUT
         )
+    except req_lib.exceptions.RequestException:
+        _api_failure_until = time.monotonic() + CAPTCHA_API_COOLDOWN
+        raise
 
-    result = response.json()
-    if not isinstance(result, int):
-        raise RuntimeError(f"Captcha API returned non-integer: {result}")
+    if response.status_code >= 500:
+        _api_failure_until = time.monotonic() + CAPTCHA_API_COOLDOWN
 
-    if not 0 <= result <= 3:
-        raise RuntimeError(f"Captcha API returned out-of-range answer: {result}")
+    # The body is a bare integer, so parse the raw bytes directly rather
+    # than going through response.json() and its charset detection.
+    # Status, type and range are validated in a single check.
+    try:
+        result = int(response.content)
+    except ValueError:
+        result = -1
+    if response.status_code != 200 or not 0 <= result <= 3:
+        raise RuntimeError(
+            f"Captcha API bad response: status={response.status_code} "
+            f"body={response.content[:200]!r}"
+        )
 
     logger.info("Captcha API returned answer: %d", result)
     return result
@@ -89,13 +137,18 @@ def _solve_via_terminal(is_interactive: bool) -> int:
     RuntimeError
         If not interactive.
     """
+    from autoIkabot.ui.prompts import read_choice
+
     if not is_interactive:
         raise RuntimeError("Cannot prompt for captcha in non-interactive mode")
 
-    print("\n  A captcha challenge was presented during login.")
-    print("  The captcha images have been downloaded but cannot be")
-    print("  displayed in this terminal. Please choose 1-4:")
-    print("  (If you can see the images, pick the correct icon number)")
+    sys.stdout.write(
+        "\n  A captcha challenge was presented during login.\n"
+        "  The captcha images have been downloaded but cannot be\n"
+        "  displayed in this terminal. Please choose 1-4:\n"
+        "  (If you can see the images, pick the correct icon number)\n"
+    )
+    sys.stdout.flush()
 
     choice = read_choice("  Your answer (1-4): ", min_val=1, max_val=4)
     return choice - 1  # Convert 1-based to 0-based
@@ -2,26 +2,45 @@
 
 The ikabot third-party API server publishes its current address as a DNS
 TXT record on ikagod.twilightparadox.com.  This module resolves that record
-via raw UDP socket (no external DNS library needed) with fallback to nslookup.
+by sending one raw UDP query to several DNS servers at once and taking the
+first valid reply.  Replies are parsed with dnspython when it is installed
+(optional ``dns`` extra), otherwise with a minimal built-in parser.
 
-The resolved address is cached for the duration of the process — we only
-need to look it up once per session.
+The resolved address is cached for the duration of the process and also
+persisted to disk, so new processes skip DNS while the cached value is
+fresh and can fall back to a stale value when every DNS server fails.
 """
 
+import functools
+import ipaddress
+import json
 import os
+import select
 import socket
 import struct
-from typing import Optional
-
-from autoIkabot.config import CUSTOM_API_ADDRESS_ENV, PUBLIC_API_DOMAIN
+import time
+from typing import List, Optional, Tuple
+
+from autoIkabot.config import (
+    API_ADDRESS_CACHE_FILE,
+    API_ADDRESS_CACHE_TTL,
+    CUSTOM_API_ADDRESS_ENV,
+    PUBLIC_API_DOMAIN,
+    RESOLVED_API_ADDRESS_ENV,
+)
 from autoIkabot.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Module-level cache: once resolved, we reuse the address all session.
-_cached_address: Optional[str] = None
+# Overall wait for the first usable DNS reply
+DNS_TIMEOUT = 5  # seconds
+_DNS_PORT = 53
+
+# DNS header: ID, flags (standard query + recursion desired), 1 question
+_DNS_QUERY_HEADER = struct.pack(">HHHHHH", 0x1234, 0x0100, 1, 0, 0, 0)
 
 
+@functools.lru_cache(maxsize=8)
 def _build_dns_query(domain: str) -> bytes:
     """Build a raw DNS query packet for a TXT record.
 
@@ -35,17 +54,20 @@ def _build_dns_query(domain: str) -> bytes:
     bytes
         A DNS query packet ready to send over UDP.
     """
-    # Header: ID, flags (standard query + recursion desired), 1 question
-    header = struct.pack(">HHHHHH", 0x1234, 0x0100, 1, 0, 0, 0)
-
     # Question section: encode domain labels
-    question = b""
+    question = bytearray()
     for label in domain.split("."):
-        question += struct.pack("B", len(label)) + label.encode("utf-8")
-    question += struct.pack("B", 0)              # root label terminator
-    question += struct.pack(">HH", 0x0010, 1)    # QTYPE=TXT, QCLASS=IN
+        encoded = label.encode("utf-8")
+        question.append(len(encoded))
+        question += encoded
+    question.append(0)                   # root label terminator
+    question += b"\x00\x10\x00\x01"   # QTYPE=TXT, QCLASS=IN
+
+    return _DNS_QUERY_HEADER + bytes(question)
 
-    return header + question
+
+# The only domain ever queried in practice — its packet is a constant.
+_DEFAULT_QUERY = _build_dns_query(PUBLIC_API_DOMAIN)
 
 
 def _parse_txt_response(response: bytes) -> str:
@@ -66,14 +88,12 @@ def _parse_txt_response(response: bytes) -> str:
     ValueError
         If no TXT record is found in the response.
     """
-    offset = 12  # skip the 12-byte header
-
-    # Skip the question section (one question)
-    while True:
-        length = response[offset]
-        if length == 0:
-            break
-        offset += length + 1
+    # Zero-copy view for field reads; bytes.index stays on the raw buffer
+    view = memoryview(response)
+
+    # Skip the 12-byte header and the question section (one question).
+    # Query names are never compressed, so the name ends at the first NUL.
+    offset = response.index(b"\x00", 12)
     offset += 5  # skip zero byte + QTYPE (2) + QCLASS (2)
 
     # Parse answer records
@@ -82,26 +102,21 @@ def _parse_txt_response(response: bytes) -> str:
         if response[offset] & 0xC0 == 0xC0:
             offset += 2  # compressed pointer
         else:
-            while True:
-                length = response[offset]
-                if length == 0:
-                    offset += 1
-                    break
-                offset += length + 1
-
-        rtype = struct.unpack(">H", response[offset:offset + 2])[0]
+            offset = response.index(b"\x00", offset) + 1
+
+        rtype = struct.unpack_from(">H", view, offset)[0]
         # Skip TYPE(2) + CLASS(2) + TTL(4) = 8 bytes to reach RDLENGTH
-        rdlength = struct.unpack(">H", response[offset + 8:offset + 10])[0]
+        rdlength = struct.unpack_from(">H", view, offset + 8)[0]
         offset += 10  # now pointing at RDATA
 
         if rtype == 16:  # TXT record
-            txt_data = response[offset:offset + rdlength]
+            txt_data = view[offset:offset + rdlength]
             # TXT RDATA is one or more length-prefixed strings
             parts = []
             pos = 0
             while pos < len(txt_data):
                 slen = txt_data[pos]
-                parts.append(txt_data[pos + 1:pos + 1 + slen].decode("utf-8"))
+                parts.append(bytes(txt_data[pos + 1:pos + 1 + slen]).decode("utf-8"))
                 pos += 1 + slen
             return "".join(parts)
         else:
@@ -110,27 +125,290 @@ def _parse_txt_response(response: bytes) -> str:
     raise ValueError("No TXT record found in DNS response")
 
 
-def _dns_txt_via_socket(domain: str, dns_server: str = "8.8.8.8") -> str:
-    """Resolve a DNS TXT record using a raw UDP socket.
+def _parse_txt_via_dnspython(response: bytes) -> Optional[str]:
+    """Extract the TXT record value with dnspython's wire parser, if installed.
+
+    Parameters
+    ----------
+    response : bytes
+        Raw DNS response bytes.
+
+    Returns
+    -------
+    Optional[str]
+        The TXT record value, or None if dnspython is not available.
+
+    Raises
+    ------
+    ValueError
+        If no TXT record is found in the response.
+    """
+    try:
+        import dns.message
+        import dns.rdatatype
+    except ImportError:
+        return None
+
+    message = dns.message.from_wire(response)
+    for rrset in message.answer:
+        if rrset.rdtype == dns.rdatatype.TXT:
+            return b"".join(rrset[0].strings).decode("utf-8")
+    raise ValueError("No TXT record found in DNS response")
+
+
+def _txt_to_address(txt: str) -> str:
+    """Turn the API TXT record value into a URL prefix.
+
+    Parameters
+    ----------
+    txt : str
+        The TXT record value.
+
+    Returns
+    -------
+    str
+        Full URL prefix, e.g. "http://1.2.3.4:5000"
+
+    Raises
+    ------
+    ValueError
+        If the TXT record does not look like an address.
+    """
+    # The TXT record contains an address like "1.2.3.4:5000"
+    # Strip any path suffix (ikabot reference does .replace("/ikagod/ikabot", ""))
+    address = "http://" + txt.replace("/ikagod/ikabot", "")
+    # Basic validation: must contain a dot or colon (IPv4, IPv6, hostname)
+    bare = address.replace("http://", "")
+    if "." not in bare and ":" not in bare:
+        raise ValueError(f"Bad address from DNS: {address}")
+    return address
+
+
+def _is_ip_literal(dns_server: str) -> bool:
+    """Return True if ``dns_server`` is an IPv4 address rather than a name."""
+    try:
+        ipaddress.IPv4Address(dns_server)
+    except ValueError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_server_name(dns_server: str) -> str:
+    """Look up a DNS server's hostname (memoized; failures are retried)."""
+    return socket.gethostbyname(dns_server)
+
+
+def _query_dns_servers(domain: str, dns_servers: List[str]) -> Tuple[str, str]:
+    """Send the TXT query to every DNS server at once over one UDP socket.
+
+    The same query packet is sent to all servers, then ``select`` waits for
+    replies; the first one that parses into a valid address wins.  A slow
+    or dead resolver therefore costs nothing as long as another answers.
 
     Parameters
     ----------
     domain : str
         Domain to look up.
-    dns_server : str
-        DNS server IP to query.
+    dns_servers : List[str]
+        DNS servers to query (IP addresses or hostnames).
 
     Returns
     -------
-    str
-        The TXT record value (typically an IP address or hostname).
+    Tuple[str, str]
+        (dns_server that answered, API URL prefix).
+
+    Raises
+    ------
+    OSError
+        If no server returned a usable answer within DNS_TIMEOUT seconds
+        (``socket.timeout`` when nothing answered at all).
     """
-    query = _build_dns_query(domain)
+    query = _DEFAULT_QUERY if domain == PUBLIC_API_DOMAIN else _build_dns_query(domain)
+    last_error: Optional[Exception] = None
+
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-        sock.settimeout(5)
-        sock.sendto(query, (dns_server, 53))
-        data, _ = sock.recvfrom(512)
-    return _parse_txt_response(data)
+        sock.setblocking(False)
+
+        # Map resolver IP -> configured name so replies can be attributed.
+        # IP literals go out first so a slow hostname lookup (blocking
+        # gethostbyname) doesn't hold up the servers that need none.
+        pending = {}
+        for dns_server in sorted(dns_servers, key=_is_ip_literal, reverse=True):
+            try:
+                if _is_ip_literal(dns_server):
+                    server_ip = dns_server
+                else:
+                    server_ip = _resolve_server_name(dns_server)
+                sock.sendto(query, (server_ip, _DNS_PORT))
+                pending[server_ip] = dns_server
+            except OSError as e:
+                logger.warning("DNS TXT lookup failed via %s: %s", dns_server, e)
+                last_error = e
+
+        deadline = time.monotonic() + DNS_TIMEOUT
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([sock], [], [], remaining)
+            if not ready:
+                break
+            try:
+                data, (server_ip, _port) = sock.recvfrom(512)
+            except OSError as e:
+                # e.g. WSAECONNRESET on Windows after an ICMP unreachable
+                last_error = e
+                continue
+
+            dns_server = pending.pop(server_ip, None)
+            if dns_server is None:
+                continue  # stray packet, not one of our resolvers
+            try:
+                txt = _parse_txt_via_dnspython(data)
+                if txt is None:
+                    txt = _parse_txt_response(data)
+                return dns_server, _txt_to_address(txt)
+            except Exception as e:
+                logger.warning("DNS TXT lookup failed via %s: %s", dns_server, e)
+                last_error = e
+
+    if pending:
+        last_error = socket.timeout(
+            "No answer from " + ", ".join(pending.values())
+        )
+    raise last_error or OSError("No DNS servers to query")
+
+
+def _load_address_cache(domain: str) -> Optional[Tuple[str, float]]:
+    """Read the on-disk API address cache.
+
+    Parameters
+    ----------
+    domain : str
+        Domain the cached address must have been resolved for.
+
+    Returns
+    -------
+    Optional[Tuple[str, float]]
+        (address, resolved_at_timestamp), or None if missing/unreadable.
+    """
+    try:
+        with open(API_ADDRESS_CACHE_FILE, "r") as f:
+            data = json.load(f)
+        if data.get("domain") != domain:
+            return None
+        return str(data["address"]), float(data["ts"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _save_address_cache(domain: str, address: str) -> None:
+    """Write the resolved API address to disk atomically."""
+    filepath = str(API_ADDRESS_CACHE_FILE)
+    tmp_path = filepath + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"domain": domain, "address": address, "ts": time.time()}, f)
+        os.replace(tmp_path, filepath)
+    except OSError as e:
+        logger.warning("Could not save API address cache: %s", e)
+
+
+def _load_exported_address(domain: str) -> Optional[Tuple[str, float]]:
+    """Read the address a parent process exported for ``domain``.
+
+    Returns
+    -------
+    Optional[Tuple[str, float]]
+        (address, resolved_at_timestamp), or None if nothing was exported
+        for this domain.
+    """
+    try:
+        address, resolved_at = json.loads(os.environ[RESOLVED_API_ADDRESS_ENV])[domain]
+        return str(address), float(resolved_at)
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def _export_address(domain: str, address: str, resolved_at: float) -> None:
+    """Pass a fresh address on to child processes through the environment."""
+    try:
+        exported = json.loads(os.environ.get(RESOLVED_API_ADDRESS_ENV, "{}"))
+        if not isinstance(exported, dict):
+            exported = {}
+    except ValueError:
+        exported = {}
+    exported[domain] = [address, resolved_at]
+    os.environ[RESOLVED_API_ADDRESS_ENV] = json.dumps(exported)
+
+
+@functools.cache
+def _resolve(domain: str) -> str:
+    """Resolve ``domain``'s API address from the disk cache or DNS.
+
+    Memoized per domain for the life of the process (use
+    ``_resolve.cache_clear()`` to reset).  Failures raise and are therefore
+    never cached, so the next call retries.
+
+    Parameters
+    ----------
+    domain : str
+        The domain whose TXT record contains the API server address.
+
+    Returns
+    -------
+    str
+        Full URL prefix, e.g. "http://1.2.3.4:5000"
+
+    Raises
+    ------
+    RuntimeError
+        If the address cannot be resolved from any source.
+    """
+    # Fresh address inherited from the parent process, then the on-disk
+    # cache.  Either is re-exported with its original timestamp so children
+    # still re-resolve once the TTL runs out.
+    stale = None
+    for load in (_load_exported_address, _load_address_cache):
+        cached = load(domain)
+        if cached is None:
+            continue
+        address, resolved_at = cached
+        if time.time() - resolved_at < API_ADDRESS_CACHE_TTL:
+            _export_address(domain, address, resolved_at)
+            return address
+        if stale is None or resolved_at > stale[1]:
+            stale = cached
+
+    # DNS TXT lookup — query all DNS servers at once so one slow or
+    # dead resolver doesn't add its full timeout to startup
+    dns_servers = ["ns2.afraid.org", "8.8.8.8", "1.1.1.1"]
+    last_error = None
+    try:
+        dns_server, address = _query_dns_servers(domain, dns_servers)
+    except Exception as e:
+        logger.warning("DNS TXT lookup failed: %s", e)
+        last_error = e
+    else:
+        _save_address_cache(domain, address)
+        _export_address(domain, address, time.time())
+        logger.info(
+            "Resolved API address via DNS (%s): %s", dns_server, address
+        )
+        return address
+
+    # Stale cached address beats failing outright
+    if stale is not None:
+        cached, _ = stale
+        logger.warning(
+            "DNS lookup failed, using stale cached API address: %s", cached
+        )
+        return cached
+
+    raise RuntimeError(
+        f"Could not resolve API server address for {domain}: {last_error}"
+    )
 
 
 def get_api_address(domain: str = PUBLIC_API_DOMAIN) -> str:
@@ -138,10 +416,16 @@ def get_api_address(domain: str = PUBLIC_API_DOMAIN) -> str:
 
     Checks in order:
     1. CUSTOM_API_ADDRESS environment variable (overrides everything)
-    2. Module-level cache (already resolved this session)
-    3. DNS TXT lookup via socket against multiple DNS servers
+    2. In-memory cache (already resolved this session, per domain)
+    3. Address exported by the parent process, or the on-disk cache, if
+       resolved less than API_ADDRESS_CACHE_TTL ago
+    4. DNS TXT lookup sent to multiple DNS servers concurrently; the
+       first valid answer wins
+    5. Cached address of any age (stale), if every DNS server failed
 
-    The result is cached so subsequent calls are instant.
+    The result is cached in memory and on disk, and exported to child
+    processes per domain, so subsequent calls and new processes are
+    instant.
 
     Parameters
     ----------
@@ -158,42 +442,11 @@ def get_api_address(domain: str = PUBLIC_API_DOMAIN) -> str:
     RuntimeError
         If the address cannot be resolved from any source.
     """
-    global _cached_address
-
     # 1. Environment override
     custom = os.environ.get(CUSTOM_API_ADDRESS_ENV)
     if custom:
         logger.info("Using custom API address from env: %s", custom)
         return custom
 
-    # 2. Cache hit
-    if _cached_address is not None:
-        return _cached_address
-
-    # 3. DNS TXT lookup — try multiple DNS servers
-    dns_servers = ["ns2.afraid.org", "8.8.8.8", "1.1.1.1"]
-    last_error = None
-    for dns_server in dns_servers:
-        try:
-            txt = _dns_txt_via_socket(domain, dns_server)
-            # The TXT record contains an address like "1.2.3.4:5000"
-            # Strip any path suffix (ikabot reference does .replace("/ikagod/ikabot", ""))
-            address = "http://" + txt.replace("/ikagod/ikabot", "")
-            # Basic validation: must contain a dot or colon (IPv4, IPv6, hostname)
-            bare = address.replace("http://", "")
-            if "." not in bare and ":" not in bare:
-                raise ValueError(f"Bad address from DNS: {address}")
-            _cached_address = address
-            logger.info(
-                "Resolved API address via DNS (%s): %s", dns_server, address
-            )
-            return address
-        except Exception as e:
-            logger.warning(
-                "DNS TXT lookup failed via %s: %s", dns_server, e
-            )
-            last_error = e
-
-    raise RuntimeError(
-        f"Could not resolve API server address for {domain}: {last_error}"
-    )
+    # 2-5. Memoized disk-cache / DNS resolution
+    return _resolve(domain)
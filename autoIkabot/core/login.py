@@ -13,15 +13,22 @@ a game Session object.
 """
 
 import json
-import random
 import re
+import secrets
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import InsecureRequestWarning
+from urllib3.util.retry import Retry
 
+from autoIkabot import config
 from autoIkabot.config import (
     AUTH_OPTIONS_URL,
     AUTH_SESSION_URL,
@@ -40,10 +47,12 @@ from autoIkabot.config import (
     PIXEL_ZIRKUS_URL,
     REQUEST_TIMEOUT,
     SSL_VERIFY,
+    UA_HASH_V2,
 )
 from autoIkabot.core.captcha_handler import solve_captcha
 from autoIkabot.core.token_handler import get_blackbox_token
 from autoIkabot.ui.prompts import read_choice, read_input
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -51,6 +60,127 @@ logger = get_logger(__name__)
 # Suppress urllib3 SSL warnings (we still verify; these are just noisy logs)
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
 
+# Patterns used on every login attempt, compiled once at import
+_RE_GAME_ENV_ID = re.compile(r'"gameEnvironmentId":"(.*?)"')
+_RE_PLATFORM_GAME_ID = re.compile(r'"platformGameId":"(.*?)"')
+_RE_SERVER_SEL = re.compile(r"s(\d+)-(\w+)")
+_RE_GAME_URL = re.compile(r"https://s\d+-\w+\.ikariam\.gameforge\.com/index\.php\?")
+
+# Phase 10 indicators: vacation mode, logout URL, logout link
+_PHASE_10_MARKERS = ("nologin_umod", "index.php?logout", '<a class="logout"')
+_PHASE_10_MARKERS_BYTES = tuple(m.encode("ascii") for m in _PHASE_10_MARKERS)
+
+# Only advertise Brotli when urllib3 can decode it (brotli/brotlicffi
+# installed); otherwise a br-encoded body would reach us still compressed.
+_ACCEPT_ENCODING = (
+    "gzip, deflate, br" if "br" in urllib3.util.request.ACCEPT_ENCODING
+    else "gzip, deflate"
+)
+
+# ---------------------------------------------------------------------------
+# Header templates — static parts of each phase's headers.  Call sites copy
+# a template with {**_X_HEADERS, ...} and add the User-Agent plus any
+# per-request fields (Authorization, Referer, ...).
+# ---------------------------------------------------------------------------
+_LOBBY_HEADERS = {
+    "Host": "lobby.ikariam.gameforge.com",
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "DNT": "1",
+    "Referer": f"{LOBBY_URL}/",
+}
+
+_CLOUDFLARE_HEADERS = {
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "DNT": "1",
+    "Referer": f"{LOBBY_URL}/",
+}
+
+_PIXEL_HEADERS = {
+    "Host": "pixelzirkus.gameforge.com",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Origin": f"{LOBBY_URL}",
+    "DNT": "1",
+    "Referer": f"{LOBBY_URL}/",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+_AUTH_HEADERS = {
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "Access-Control-Request-Headers": "content-type,tnt-installation-id",
+    "Access-Control-Request-Method": "POST",
+    "Origin": f"{LOBBY_URL}",
+    "Referer": f"{LOBBY_URL}/",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "no-cors",
+    "Sec-Fetch-Site": "same-site",
+    "TE": "trailers",
+}
+
+_CAPTCHA_HEADERS = {
+    "accept": "*/*",
+    "accept-encoding": _ACCEPT_ENCODING,
+    "accept-language": "en-GB,el;q=0.9",
+    "dnt": "1",
+    "origin": f"{LOBBY_URL}",
+    "referer": f"{LOBBY_URL}/",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-site",
+}
+
+_LOGIN_LINK_HEADERS = {
+    "authority": "lobby.ikariam.gameforge.com",
+    "method": "POST",
+    "path": "/api/users/me/loginLink",
+    "scheme": "https",
+    "accept": "application/json",
+    "accept-encoding": _ACCEPT_ENCODING,
+    "accept-language": "en-US,en;q=0.9",
+    "content-type": "application/json",
+    "origin": f"{LOBBY_URL}",
+    "referer": f"{LOBBY_URL}/en_GB/accounts",
+}
+
+# Game server requests; Host, User-Agent, Referer and Origin are per login
+_GAME_HEADERS = {
+    "Host": "",
+    "User-Agent": "",
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "Referer": "",
+    "X-Requested-With": "XMLHttpRequest",
+    "Origin": "",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Pragma": "no-cache",
+    "Cache-Control": "no-cache",
+}
+
+# User-agent pool, loaded from USER_AGENTS_FILE on first login
+_UA_POOL: Optional[List[Dict[str, str]]] = None
+_UA_POOL_LOCK = threading.Lock()
+
+# Used when USER_AGENTS_FILE is missing or unreadable
+_FALLBACK_UA_ENTRY = {
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/123.0.0.0 Safari/537.36",
+    "sec_ch_ua": '"Google Chrome";v="123", "Not:A-Brand";v="8", '
+                 '"Chromium";v="123"',
+    "sec_ch_ua_mobile": "?0",
+    "sec_ch_ua_platform": '"Windows"',
+}
+
 
 @dataclass
 class LoginResult:
@@ -110,22 +240,47 @@ class VacationModeError(Exception):
     pass
 
 
-def _gen_rand_hex() -> str:
-    """Generate a random 4-digit hex string (like ikabot's __genRand)."""
-    return hex(random.randint(0, 65535))[2:]
-
-
 def _gen_fp_eval_id() -> str:
     """Generate a UUID-like fingerprint eval ID for Pixel Zirkus."""
-    r = _gen_rand_hex
-    return f"{r()}{r()}-{r()}-{r()}-{r()}-{r()}{r()}{r()}"
+    h = secrets.token_hex(16)
+    return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+
+
+def _load_ua_pool() -> List[Dict[str, str]]:
+    """Load and memoize the user-agent pool from USER_AGENTS_FILE.
+
+    The file is read once per process; later calls return the cached list.
+
+    Returns
+    -------
+    list
+        User-agent entries (never empty — falls back to a single default).
+    """
+    global _UA_POOL
+
+    if _UA_POOL is not None:
+        return _UA_POOL
+
+    with _UA_POOL_LOCK:
+        if _UA_POOL is None:
+            try:
+                # Read through the module so the lazily built path is only
+                # computed on first login, not when login.py is imported
+                with open(config.USER_AGENTS_FILE, "r", encoding="utf-8") as f:
+                    pool = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                logger.warning("Could not load user agents file: %s — using fallback", e)
+                pool = [_FALLBACK_UA_ENTRY]
+            _UA_POOL = pool
+    return _UA_POOL
 
 
 def _select_user_agent(email: str) -> Dict[str, str]:
     """Select a user-agent entry deterministically based on email.
 
     Uses the same hash as ikabot: sum of ord(char) for each char in email,
-    modulo the pool size.
+    modulo the pool size.  With UA_HASH_V2 enabled, CRC32 of the email is
+    used instead for a more even spread over the pool.
 
     Parameters
     ----------
@@ -138,25 +293,11 @@ def _select_user_agent(email: str) -> Dict[str, str]:
         User-agent entry with keys: user_agent, sec_ch_ua, sec_ch_ua_mobile,
         sec_ch_ua_platform.
     """
-    import json as json_mod
-    from autoIkabot.config import USER_AGENTS_FILE
-
-    try:
-        with open(USER_AGENTS_FILE, "r", encoding="utf-8") as f:
-            pool = json_mod.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        logger.warning("Could not load user agents file: %s — using fallback", e)
-        pool = [{
-            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                          "AppleWebKit/537.36 (KHTML, like Gecko) "
-                          "Chrome/123.0.0.0 Safari/537.36",
-            "sec_ch_ua": '"Google Chrome";v="123", "Not:A-Brand";v="8", '
-                         '"Chromium";v="123"',
-            "sec_ch_ua_mobile": "?0",
-            "sec_ch_ua_platform": '"Windows"',
-        }]
-
-    index = sum(ord(c) for c in email) % len(pool)
+    pool = _load_ua_pool()
+    if UA_HASH_V2:
+        index = zlib.crc32(email.encode("utf-8")) % len(pool)
+    else:
+        index = sum(map(ord, email)) % len(pool)
     entry = pool[index]
     logger.info("Selected user-agent [%d/%d] for %s", index, len(pool), email)
     return entry
@@ -167,7 +308,8 @@ def _test_lobby_cookie(
 ) -> bool:
     """Test if the gf-token-production cookie is still valid.
 
-    Makes a request to the lobby API to check if the Bearer token works.
+    Makes a HEAD request to the lobby API to check if the Bearer token
+    works (falling back to a GET whose body is not read).
 
     Parameters
     ----------
@@ -186,21 +328,24 @@ def _test_lobby_cookie(
         return False
 
     headers = {
-        "Host": "lobby.ikariam.gameforge.com",
+        **_LOBBY_HEADERS,
         "User-Agent": user_agent,
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "DNT": "1",
-        "Connection": "close",
-        "Referer": f"{LOBBY_URL}/",
         "Authorization": f"Bearer {gf_token}",
     }
-    http_session.headers.clear()
-    http_session.headers.update(headers)
 
     try:
-        r = http_session.get(LOBBY_ME_URL, timeout=REQUEST_TIMEOUT)
+        # Only the status matters, so skip the profile body with HEAD
+        r = http_session.head(
+            LOBBY_ME_URL, headers=headers, timeout=REQUEST_TIMEOUT,
+            allow_redirects=False,
+        )
+        if r.status_code in (405, 501):
+            # HEAD not supported — GET, but close without reading the body
+            r = http_session.get(
+                LOBBY_ME_URL, headers=headers, timeout=REQUEST_TIMEOUT,
+                stream=True,
+            )
+            r.close()
         return r.status_code == 200
     except Exception as e:
         logger.warning("Lobby cookie test failed: %s", e)
@@ -218,28 +363,17 @@ def _phase_1_environment_ids(
         (gameEnvironmentId, platformGameId) strings.
     """
     logger.info("Phase 1: Getting environment IDs")
-    headers = {
-        "Host": "lobby.ikariam.gameforge.com",
-        "User-Agent": user_agent,
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "DNT": "1",
-        "Connection": "close",
-        "Referer": f"{LOBBY_URL}/",
-    }
-    http_session.headers.clear()
-    http_session.headers.update(headers)
+    headers = {**_LOBBY_HEADERS, "User-Agent": user_agent}
 
-    r = http_session.get(LOBBY_CONFIG_URL, timeout=REQUEST_TIMEOUT)
+    r = http_session.get(LOBBY_CONFIG_URL, headers=headers, timeout=REQUEST_TIMEOUT)
     js = r.text
 
-    match_env = re.search(r'"gameEnvironmentId":"(.*?)"', js)
+    match_env = _RE_GAME_ENV_ID.search(js)
     if match_env is None:
         raise LoginError("gameEnvironmentId not found in configuration.js")
     game_env_id = match_env.group(1)
 
-    match_plat = re.search(r'"platformGameId":"(.*?)"', js)
+    match_plat = _RE_PLATFORM_GAME_ID.search(js)
     if match_plat is None:
         raise LoginError("platformGameId not found in configuration.js")
     platform_game_id = match_plat.group(1)
@@ -255,21 +389,12 @@ def _phase_2_cloudflare(
     logger.info("Phase 2: Cloudflare handshake")
 
     # GET connect.js for __cfduid
-    headers = {
-        "User-Agent": user_agent,
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "DNT": "1",
-        "Connection": "close",
-        "Referer": f"{LOBBY_URL}/",
-    }
-    http_session.headers.clear()
-    http_session.headers.update(headers)
-    r = http_session.get(CLOUDFLARE_CONNECT_URL, timeout=REQUEST_TIMEOUT)
+    headers = {**_CLOUDFLARE_HEADERS, "User-Agent": user_agent}
+    r = http_session.get(CLOUDFLARE_CONNECT_URL, headers=headers, timeout=REQUEST_TIMEOUT)
 
     # Check for Cloudflare captcha block
-    if re.search(r"Attention Required", r.text):
+    # (plain substring on the raw bytes — no decode of the JS body needed)
+    if b"Attention Required" in r.content:
         raise LoginError(
             "Cloudflare CAPTCHA detected! Cannot proceed. "
             "Try again later or from a different IP."
@@ -277,39 +402,33 @@ def _phase_2_cloudflare(
 
     # GET config to update tracking cookies
     headers["Origin"] = f"{LOBBY_URL}"
-    http_session.headers.clear()
-    http_session.headers.update(headers)
-    http_session.get(CLOUDFLARE_CONFIG_URL, timeout=REQUEST_TIMEOUT)
+    http_session.get(CLOUDFLARE_CONFIG_URL, headers=headers, timeout=REQUEST_TIMEOUT)
 
     logger.info("Phase 2 complete")
 
 
 def _phase_3_fingerprint(
-    http_session: requests.Session, user_agent: str
+    http_session: requests.Session, user_agent: str, skip: bool = False
 ) -> None:
-    """Phase 3: Pixel Zirkus device fingerprinting (errors silently ignored)."""
+    """Phase 3: Pixel Zirkus device fingerprinting (errors silently ignored).
+
+    Parameters
+    ----------
+    skip : bool
+        If True, skip both Pixel Zirkus POSTs (for headless/scripted runs
+        where the account already has a warm session elsewhere).
+    """
+    if skip:
+        logger.info("Phase 3: Device fingerprinting skipped")
+        return
     logger.info("Phase 3: Device fingerprinting (Pixel Zirkus)")
     try:
         fp_id_1 = _gen_fp_eval_id()
         fp_id_2 = _gen_fp_eval_id()
 
-        headers = {
-            "Host": "pixelzirkus.gameforge.com",
-            "User-Agent": user_agent,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Origin": f"{LOBBY_URL}",
-            "DNT": "1",
-            "Connection": "close",
-            "Referer": f"{LOBBY_URL}/",
-            "Upgrade-Insecure-Requests": "1",
-        }
+        headers = {**_PIXEL_HEADERS, "User-Agent": user_agent}
 
         # First POST: VISIT
-        http_session.headers.clear()
-        http_session.headers.update(headers)
         http_session.post(
             PIXEL_ZIRKUS_URL,
             data={
@@ -324,12 +443,11 @@ def _phase_3_fingerprint(
                 "fingerprint": "2175408712",
                 "fp_exec_time": "1.00",
             },
+            headers=headers,
             timeout=REQUEST_TIMEOUT,
         )
 
         # Second POST: fp_eval
-        http_session.headers.clear()
-        http_session.headers.update(headers)
         http_session.post(
             PIXEL_ZIRKUS_URL,
             data={
@@ -345,6 +463,7 @@ def _phase_3_fingerprint(
                 "fp2_value": "921af958be7cf2f76db1e448c8a5d89d",
                 "fp2_exec_time": "96.00",
             },
+            headers=headers,
             timeout=REQUEST_TIMEOUT,
         )
         logger.info("Phase 3 complete")
@@ -358,23 +477,8 @@ def _phase_4_options_preflight(
 ) -> None:
     """Phase 4: CORS OPTIONS preflight for the auth endpoint."""
     logger.info("Phase 4: CORS preflight")
-    headers = {
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Access-Control-Request-Headers": "content-type,tnt-installation-id",
-        "Access-Control-Request-Method": "POST",
-        "Origin": f"{LOBBY_URL}",
-        "Referer": f"{LOBBY_URL}/",
-        "Sec-Fetch-Dest": "empty",
-        "Sec-Fetch-Mode": "no-cors",
-        "Sec-Fetch-Site": "same-site",
-        "TE": "trailers",
-        "User-Agent": user_agent,
-    }
-    http_session.headers.clear()
-    http_session.headers.update(headers)
-    http_session.options(AUTH_OPTIONS_URL, timeout=REQUEST_TIMEOUT)
+    headers = {**_AUTH_HEADERS, "User-Agent": user_agent}
+    http_session.options(AUTH_OPTIONS_URL, headers=headers, timeout=REQUEST_TIMEOUT)
     logger.info("Phase 4 complete")
 
 
@@ -405,26 +509,13 @@ def _phase_5_authenticate(
     """
     logger.info("Phase 5: Authenticating")
     headers = {
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Access-Control-Request-Headers": "content-type,tnt-installation-id",
-        "Access-Control-Request-Method": "POST",
-        "Origin": f"{LOBBY_URL}",
-        "Referer": f"{LOBBY_URL}/",
-        "Sec-Fetch-Dest": "empty",
-        "Sec-Fetch-Mode": "no-cors",
-        "Sec-Fetch-Site": "same-site",
-        "TE": "trailers",
+        **_AUTH_HEADERS,
         "TNT-Installation-Id": "",
         "User-Agent": user_agent,
     }
     if challenge_id:
         headers["Gf-Challenge-Id"] = challenge_id
 
-    http_session.headers.clear()
-    http_session.headers.update(headers)
-
     data = {
         "identity": email,
         "password": password,
@@ -435,7 +526,9 @@ def _phase_5_authenticate(
         "blackbox": blackbox,
     }
 
-    r = http_session.post(AUTH_SESSION_URL, json=data, timeout=REQUEST_TIMEOUT)
+    r = http_session.post(
+        AUTH_SESSION_URL, json=data, headers=headers, timeout=REQUEST_TIMEOUT
+    )
 
     # Phase 5b: 2FA handling
     if r.status_code == 409 and "OTP_REQUIRED" in r.text:
@@ -448,7 +541,9 @@ def _phase_5_authenticate(
         print("\n  Two-factor authentication (2FA) is required.")
         mfa_code = read_input("  Enter your 2FA code: ").strip()
         data["otpCode"] = mfa_code
-        r = http_session.post(AUTH_SESSION_URL, json=data, timeout=REQUEST_TIMEOUT)
+        r = http_session.post(
+            AUTH_SESSION_URL, json=data, headers=headers, timeout=REQUEST_TIMEOUT
+        )
 
     return r
 
@@ -482,7 +577,7 @@ def _phase_6_captcha(
     max_attempts = 5
 
     for attempt in range(max_attempts):
-        if "gf-challenge-id" not in r.headers or "token" in r.text:
+        if "gf-challenge-id" not in r.headers or b"token" in r.content:
             return r
 
         challenge_id = r.headers["gf-challenge-id"].split(";")[0]
@@ -492,39 +587,40 @@ def _phase_6_captcha(
             print(f"\n  Captcha challenge detected (attempt {attempt + 1}/{max_attempts})")
 
         # Fetch captcha images
-        captcha_headers = {
-            "accept": "*/*",
-            "accept-encoding": "gzip, deflate, br",
-            "accept-language": "en-GB,el;q=0.9",
-            "dnt": "1",
-            "origin": f"{LOBBY_URL}",
-            "referer": f"{LOBBY_URL}/",
-            "sec-fetch-dest": "empty",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-site": "same-site",
-            "user-agent": user_agent,
-        }
-        http_session.headers.clear()
-        http_session.headers.update(captcha_headers)
+        captcha_headers = {**_CAPTCHA_HEADERS, "user-agent": user_agent}
 
         # Get challenge landing page
         http_session.get(
             f"https://challenge.gameforge.com/challenge/{challenge_id}",
+            headers=captcha_headers,
             timeout=REQUEST_TIMEOUT,
         )
 
         # Get captcha metadata (contains timestamp)
         meta_url = CAPTCHA_IMAGE_BASE_URL.format(challenge_id=challenge_id)
-        captcha_meta = http_session.get(meta_url, timeout=REQUEST_TIMEOUT).json()
+        captcha_meta = fastjson.loads(http_session.get(
+            meta_url, headers=captcha_headers, timeout=REQUEST_TIMEOUT
+        ).content)
         captcha_time = captcha_meta["lastUpdated"]
 
-        # Download images
-        text_image = http_session.get(
-            f"{meta_url}/text?{captcha_time}", timeout=REQUEST_TIMEOUT
-        ).content
-        drag_icons = http_session.get(
-            f"{meta_url}/drag-icons?{captcha_time}", timeout=REQUEST_TIMEOUT
-        ).content
+        # Download both images concurrently — they are independent, so this
+        # saves a round-trip per captcha attempt. Headers are passed per
+        # request, so the two threads never touch shared session headers.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            text_future = pool.submit(
+                http_session.get,
+                f"{meta_url}/text?{captcha_time}",
+                headers=captcha_headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            icons_future = pool.submit(
+                http_session.get,
+                f"{meta_url}/drag-icons?{captcha_time}",
+                headers=captcha_headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            text_image = text_future.result().content
+            drag_icons = icons_future.result().content
 
         # Solve via resolver chain
         try:
@@ -534,9 +630,12 @@ def _phase_6_captcha(
             raise LoginError(f"Could not solve captcha: {e}")
 
         # Submit answer
-        submit_resp = http_session.post(
-            meta_url, json={"answer": answer}, timeout=REQUEST_TIMEOUT
-        ).json()
+        submit_resp = fastjson.loads(http_session.post(
+            meta_url,
+            json={"answer": answer},
+            headers=captcha_headers,
+            timeout=REQUEST_TIMEOUT,
+        ).content)
 
         if submit_resp.get("status") == "solved":
             logger.info("Captcha solved successfully")
@@ -571,8 +670,10 @@ def _phase_7_extract_token(
     """
     logger.info("Phase 7: Extracting auth token")
 
-    if "token" in auth_response.text:
-        ses_json = json.loads(auth_response.text, strict=False)
+    # Check the raw bytes so the body is only decoded when it is parsed
+    has_token = b"token" in auth_response.content
+    if has_token:
+        ses_json = fastjson.loads(auth_response.content)
         auth_token = ses_json["token"]
         logger.info("Got gf-token-production from auth response")
     elif is_interactive:
@@ -602,15 +703,12 @@ def _phase_7_extract_token(
         )
 
     # Set the cookie on the session
-    cookie_obj = requests.cookies.create_cookie(
-        domain=".gameforge.com",
-        name="gf-token-production",
-        value=auth_token,
+    http_session.cookies.set(
+        "gf-token-production", auth_token, domain=".gameforge.com"
     )
-    http_session.cookies.set_cookie(cookie_obj)
 
     # Verify it works
-    if "token" not in auth_response.text:
+    if not has_token:
         # Only verify if we got it manually
         if not _test_lobby_cookie(http_session, http_session.headers.get("User-Agent", "")):
             raise LoginError("Manually entered gf-token-production is invalid")
@@ -637,29 +735,32 @@ def _phase_8_accounts_and_servers(
         selected Gameforge account and server_dict has matched server info.
     """
     logger.info("Phase 8: Getting accounts and servers")
-    gf_token = http_session.cookies["gf-token-production"]
+    gf_token = http_session.cookies.get("gf-token-production")
+    if not gf_token:
+        raise LoginError("gf-token-production cookie is missing")
 
     headers = {
-        "Host": "lobby.ikariam.gameforge.com",
+        **_LOBBY_HEADERS,
         "User-Agent": user_agent,
         "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
         "Referer": f"{LOBBY_URL}/es_AR/hub",
         "Authorization": f"Bearer {gf_token}",
-        "DNT": "1",
-        "Connection": "close",
     }
 
     # Get accounts
-    http_session.headers.clear()
-    http_session.headers.update(headers)
-    r = http_session.get(LOBBY_ACCOUNTS_URL, timeout=REQUEST_TIMEOUT)
-    accounts = json.loads(r.text, strict=False)
+    r = http_session.get(LOBBY_ACCOUNTS_URL, headers=headers, timeout=REQUEST_TIMEOUT)
+    accounts = fastjson.loads(r.content)
 
     # Get servers
-    r = http_session.get(LOBBY_SERVERS_URL, timeout=REQUEST_TIMEOUT)
-    servers = json.loads(r.text, strict=False)
+    r = http_session.get(LOBBY_SERVERS_URL, headers=headers, timeout=REQUEST_TIMEOUT)
+    servers = fastjson.loads(r.content)
+
+    # Index servers by accountGroup for the account <-> server joins below
+    # (first entry wins, as with the previous linear scans)
+    srv_by_group = {}
+    for srv in servers:
+        if "accountGroup" in srv:
+            srv_by_group.setdefault(srv["accountGroup"], srv)
 
     # Filter to non-blocked accounts
     valid_accounts = [a for a in accounts if not a.get("blocked", False)]
@@ -670,7 +771,7 @@ def _phase_8_accounts_and_servers(
     account = None
     if selected_server:
         # Parse "s59-en" → number=59, language=en
-        match = re.match(r"s(\d+)-(\w+)", selected_server)
+        match = _RE_SERVER_SEL.match(selected_server)
         if match:
             target_num = match.group(1)
             target_lang = match.group(2)
@@ -691,11 +792,7 @@ def _phase_8_accounts_and_servers(
                 srv = a.get("server", {})
                 # Find the server name from the servers list
                 ag = a.get("accountGroup", "")
-                world_name = ""
-                for s in servers:
-                    if s.get("accountGroup") == ag:
-                        world_name = s.get("name", "")
-                        break
+                world_name = srv_by_group.get(ag, {}).get("name", "")
                 print(
                     f"  ({i}) {a['name']}  "
                     f"[{srv.get('language', '?')}{srv.get('number', '?')} - {world_name}]"
@@ -715,13 +812,9 @@ def _phase_8_accounts_and_servers(
     account_id = account["id"]
 
     # Find the matching server for world name and language
-    world_name = ""
-    servidor = login_servidor
-    for s in servers:
-        if s.get("accountGroup") == account_group:
-            world_name = s.get("name", "")
-            servidor = s.get("language", login_servidor)
-            break
+    server = srv_by_group.get(account_group, {})
+    world_name = server.get("name", "")
+    servidor = server.get("language", login_servidor)
 
     logger.info(
         "Phase 8 complete: player=%s, server=s%s-%s (%s)",
@@ -757,24 +850,15 @@ def _phase_9_game_cookies(
         The initial HTML from the game server (for Phase 10 validation).
     """
     logger.info("Phase 9: Getting game server cookies")
-    gf_token = http_session.cookies["gf-token-production"]
+    gf_token = http_session.cookies.get("gf-token-production")
+    if not gf_token:
+        raise LoginError("gf-token-production cookie is missing")
 
     headers = {
-        "authority": "lobby.ikariam.gameforge.com",
-        "method": "POST",
-        "path": "/api/users/me/loginLink",
-        "scheme": "https",
-        "accept": "application/json",
-        "accept-encoding": "gzip, deflate, br",
-        "accept-language": "en-US,en;q=0.9",
+        **_LOGIN_LINK_HEADERS,
         "authorization": f"Bearer {gf_token}",
-        "content-type": "application/json",
-        "origin": f"{LOBBY_URL}",
-        "referer": f"{LOBBY_URL}/en_GB/accounts",
         "user-agent": user_agent,
     }
-    http_session.headers.clear()
-    http_session.headers.update(headers)
 
     data = {
         "server": {
@@ -787,9 +871,9 @@ def _phase_9_game_cookies(
     }
 
     resp = http_session.post(
-        LOBBY_LOGIN_LINK_URL, json=data, timeout=REQUEST_TIMEOUT
+        LOBBY_LOGIN_LINK_URL, json=data, headers=headers, timeout=REQUEST_TIMEOUT
     )
-    resp_json = json.loads(resp.text)
+    resp_json = fastjson.loads(resp.content)
 
     if "url" not in resp_json:
         raise LoginError(
@@ -798,26 +882,48 @@ def _phase_9_game_cookies(
 
     login_url = resp_json["url"]
     # Verify URL pattern
-    if not re.search(r"https://s\d+-\w+\.ikariam\.gameforge\.com/index\.php\?", login_url):
+    if not _RE_GAME_URL.search(login_url):
         raise LoginError(f"Unexpected login URL format: {login_url}")
 
-    # Follow the login URL — this sets game server cookies
-    http_session.headers.clear()
-    http_session.headers.update(game_headers)
-
-    html = http_session.get(
-        login_url, verify=SSL_VERIFY, timeout=REQUEST_TIMEOUT
-    ).text
+    # Follow the login URL — this sets game server cookies.
+    # The body is streamed so a page that already shows a Phase 10 failure
+    # marker (vacation mode / logged out) is not downloaded in full.
+    resp = http_session.get(
+        login_url,
+        headers=game_headers,
+        verify=SSL_VERIFY,
+        timeout=REQUEST_TIMEOUT,
+        stream=True,
+    )
+    body = bytearray()
+    overlap = max(len(m) for m in _PHASE_10_MARKERS_BYTES) - 1
+    try:
+        for chunk in resp.iter_content(chunk_size=8192):
+            # Re-scan a small overlap so markers split across chunks match
+            start = max(0, len(body) - overlap)
+            body += chunk
+            window = bytes(body[start:])
+            if any(m in window for m in _PHASE_10_MARKERS_BYTES):
+                break
+    finally:
+        resp.close()
+
+    html = body.decode(resp.encoding or "utf-8", errors="replace")
 
     logger.info("Phase 9 complete: game cookies obtained")
     return html
 
 
-def _phase_10_validate(html: str) -> None:
+def _phase_10_validate(html: Union[str, bytes]) -> None:
     """Phase 10: Validate the game session.
 
     Checks for vacation mode and session expiry indicators.
 
+    Parameters
+    ----------
+    html : str or bytes
+        The game page body, decoded or raw.
+
     Raises
     ------
     VacationModeError
@@ -827,10 +933,15 @@ def _phase_10_validate(html: str) -> None:
     """
     logger.info("Phase 10: Validating session")
 
-    if "nologin_umod" in html:
+    if isinstance(html, bytes):
+        vacation, logout, logout_link = _PHASE_10_MARKERS_BYTES
+    else:
+        vacation, logout, logout_link = _PHASE_10_MARKERS
+
+    if vacation in html:
         raise VacationModeError("Account is in vacation mode")
 
-    if "index.php?logout" in html or '<a class="logout"' in html:
+    if logout in html or logout_link in html:
         raise LoginError("Session validation failed — expired immediately")
 
     logger.info("Phase 10 complete: session is valid")
@@ -851,7 +962,8 @@ def login(
     ----------
     account_info : dict
         From run_account_selection(). Keys: email, password, selected_server,
-        gf_token, blackbox_token, proxy, proxy_auto.
+        gf_token, blackbox_token, proxy, proxy_auto, and optionally
+        skip_fingerprint (skip the Phase 3 Pixel Zirkus requests).
     is_interactive : bool
         True if running in the main process with a terminal.
     retries : int
@@ -874,12 +986,28 @@ def login(
     selected_server = account_info.get("selected_server", "")
     stored_gf_token = account_info.get("gf_token", "")
     stored_bb_token = account_info.get("blackbox_token", "")
+    skip_fingerprint = bool(account_info.get("skip_fingerprint", False))
 
     # Select deterministic user-agent for this email
     ua_entry = _select_user_agent(email)
     user_agent = ua_entry["user_agent"]
 
     http_session = requests.Session()
+    # Only the user-agent is session-wide; every phase passes its own
+    # headers per request so nothing leaks from one phase into the next.
+    http_session.headers.clear()
+    http_session.headers.update({"User-Agent": user_agent})
+    # Keep connections alive across phases: the lobby, auth and game hosts
+    # are each hit several times per login, so reuse avoids repeat TLS
+    # handshakes.  Failed connects are retried inside urllib3; reads are
+    # not, since a POST may already have reached the server.
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+    )
+    http_session.mount("https://", adapter)
+    http_session.mount("http://", adapter)
 
     # ---------- Try cached gf-token-production (skip phases 1-7) ----------
     gf_token = ""
@@ -889,12 +1017,9 @@ def login(
         logger.info("Testing cached gf-token-production")
         if is_interactive:
             print("  Testing cached lobby token...")
-        cookie_obj = requests.cookies.create_cookie(
-            domain=".gameforge.com",
-            name="gf-token-production",
-            value=stored_gf_token,
+        http_session.cookies.set(
+            "gf-token-production", stored_gf_token, domain=".gameforge.com"
         )
-        http_session.cookies.set_cookie(cookie_obj)
 
         if _test_lobby_cookie(http_session, user_agent):
             logger.info("Cached gf-token-production is valid, skipping phases 1-7")
@@ -916,14 +1041,16 @@ def login(
             print("  Obtaining blackbox token...")
         blackbox = get_blackbox_token(user_agent, stored_bb_token, is_interactive)
 
-        # Phase 1: Environment IDs
-        game_env_id, platform_game_id = _phase_1_environment_ids(http_session, user_agent)
-
-        # Phase 2: Cloudflare
-        _phase_2_cloudflare(http_session, user_agent)
+        # Phases 1 + 2: Environment IDs and Cloudflare handshake.  Neither
+        # needs the other's output, so run them on two pooled connections.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            env_future = pool.submit(_phase_1_environment_ids, http_session, user_agent)
+            cf_future = pool.submit(_phase_2_cloudflare, http_session, user_agent)
+            cf_future.result()
+            game_env_id, platform_game_id = env_future.result()
 
         # Phase 3: Fingerprinting (non-fatal)
-        _phase_3_fingerprint(http_session, user_agent)
+        _phase_3_fingerprint(http_session, user_agent, skip=skip_fingerprint)
 
         # Phase 4: CORS preflight
         _phase_4_options_preflight(http_session, user_agent)
@@ -966,18 +1093,11 @@ def login(
 
     # Headers for game server requests
     game_headers = {
+        **_GAME_HEADERS,
         "Host": host,
         "User-Agent": user_agent,
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate, br",
         "Referer": f"https://{host}",
-        "X-Requested-With": "XMLHttpRequest",
         "Origin": f"https://{host}",
-        "DNT": "1",
-        "Connection": "keep-alive",
-        "Pragma": "no-cache",
-        "Cache-Control": "no-cache",
     }
 
     # ---------- Phase 9: Game server cookies ----------
@@ -13,21 +13,34 @@ Resolver chain (in priority order):
 (Future resolvers: self-hosted API, notification fallback)
 """
 
+import functools
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from autoIkabot.config import REQUEST_TIMEOUT, SSL_VERIFY
 from autoIkabot.core.dns_resolver import get_api_address
 from autoIkabot.ui.prompts import read_input
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Pooled session so repeated token fetches reuse the keep-alive connection
+# to the API instead of paying a TCP/TLS handshake each time.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
 
+@functools.lru_cache(maxsize=128)
 def _validate_token(token: str) -> bool:
     """Check that a blackbox token has the expected structure.
 
     A valid token starts with 'tra:' and the body contains uppercase
-    letters, lowercase letters, and digits.
+    letters, lowercase letters, and digits.  Results are memoized, since
+    the same stored token is re-validated on every login.
 
     Parameters
     ----------
@@ -44,10 +57,14 @@ def _validate_token(token: str) -> bool:
     body = token[4:]
     if len(body) < 10:
         return False
-    has_upper = any(c.isupper() for c in body)
-    has_lower = any(c.islower() for c in body)
-    has_digit = any(c.isdigit() for c in body)
-    return has_upper and has_lower and has_digit
+    # One pass collecting character classes: 1=upper, 2=lower, 4=digit.
+    # Random-looking tokens show all three within a few characters.
+    flags = 0
+    for c in body:
+        flags |= 1 if c.isupper() else 2 if c.islower() else 4 if c.isdigit() else 0
+        if flags == 7:
+            return True
+    return False
 
 
 def _fetch_from_api(user_agent: str) -> str:
@@ -75,17 +92,20 @@ def _fetch_from_api(user_agent: str) -> str:
     url = f"{address}/v1/token?user_agent={user_agent}"
     logger.info("Fetching blackbox token from API: %s", url)
 
-    response = requests.get(url, verify=SSL_VERIFY, timeout=REQUEST_TIMEOUT)
+    response = _session.get(url, verify=SSL_VERIFY, timeout=REQUEST_TIMEOUT)
     if response.status_code != 200:
         raise RuntimeError(
             f"API returned status {response.status_code}: {response.text}"
         )
 
-    token_body = response.json()
-    if isinstance(token_body, dict) and token_body.get("status") == "error":
+    # Parse the raw bytes directly; the normal reply is a bare JSON string
+    token_body = fastjson.loads(response.content)
+    if isinstance(token_body, str):
+        token = "tra:" + token_body
+    elif isinstance(token_body, dict) and token_body.get("status") == "error":
         raise RuntimeError(f"API error: {token_body.get('message', 'unknown')}")
-
-    token = "tra:" + str(token_body)
+    else:
+        token = "tra:" + str(token_body)
     if not _validate_token(token):
         raise RuntimeError(f"API returned invalid token structure")
 
@@ -20,13 +20,14 @@ Account data model (dict keys per account):
     notifications    : dict         - Backend preferences (per-account)
 """
 
-import json
+import copy
+import hashlib
+import hmac
 import os
-import pathlib
-import stat
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from autoIkabot.config import ACCOUNTS_FILE
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.crypto import encrypt, decrypt
 from autoIkabot.utils.logging import get_logger
 
@@ -35,22 +36,25 @@ logger = get_logger(__name__)
 # Type alias for an account record
 Account = Dict[str, Any]
 
+# Last decrypted accounts list, keyed by the file's identity (inode, mtime,
+# size) and a keyed digest of the master password.  Decryption (Argon2 key
+# derivation + AES-GCM) dominates load time, so an unchanged file is never
+# decrypted twice.  Any write through save_accounts() or by another process
+# changes the file identity and so invalidates the entry.
+_accounts_cache: Optional[Tuple[tuple, List[Account]]] = None
 
-def _set_file_permissions(path: pathlib.Path) -> None:
-    """Set file to owner-only read/write (0o600) on Linux/Mac.
+# Random per-process HMAC key for the password digest, so the cache never
+# holds a plain hash of the master password that could be brute-forced
+# offline.
+_CACHE_KEY_SECRET = os.urandom(32)
 
-    On Windows this is a no-op (Windows uses ACLs, not POSIX permissions).
 
-    Parameters
-    ----------
-    path : pathlib.Path
-        Path to the file.
-    """
-    if os.name != "nt":
-        try:
-            path.chmod(stat.S_IRUSR | stat.S_IWUSR)  # 0o600
-        except OSError as e:
-            logger.warning("Could not set file permissions on %s: %s", path, e)
+def _cache_key(st: os.stat_result, master_password: str) -> tuple:
+    """Return the cache key for an accounts file with stat result ``st``."""
+    digest = hmac.new(
+        _CACHE_KEY_SECRET, master_password.encode("utf-8"), hashlib.sha256
+    ).digest()
+    return (st.st_ino, st.st_mtime_ns, st.st_size, digest)
 
 
 def _new_account_template() -> Account:
@@ -81,7 +85,10 @@ def accounts_file_exists() -> bool:
     -------
     bool
     """
-    return ACCOUNTS_FILE.exists() and ACCOUNTS_FILE.stat().st_size > 0
+    try:
+        return ACCOUNTS_FILE.stat().st_size > 0
+    except OSError:  # missing, or a path component is not a directory
+        return False
 
 
 def load_accounts(master_password: str) -> List[Account]:
@@ -108,13 +115,20 @@ def load_accounts(master_password: str) -> List[Account]:
         logger.info("No accounts file found, returning empty list.")
         return []
 
+    global _accounts_cache
+
+    key = _cache_key(ACCOUNTS_FILE.stat(), master_password)
+    if _accounts_cache is not None and _accounts_cache[0] == key:
+        return copy.deepcopy(_accounts_cache[1])
+
     blob = ACCOUNTS_FILE.read_bytes()
     plaintext = decrypt(blob, master_password)
-    accounts = json.loads(plaintext.decode("utf-8"))
+    accounts = fastjson.loads(plaintext)
 
     if not isinstance(accounts, list):
         raise ValueError("Accounts file is corrupt: expected a JSON list.")
 
+    _accounts_cache = (key, copy.deepcopy(accounts))
     logger.info("Loaded %d account(s) from encrypted storage.", len(accounts))
     return accounts
 
@@ -132,18 +146,38 @@ def save_accounts(accounts: List[Account], master_password: str) -> None:
     master_password : str
         The master password used to encrypt.
     """
+    global _accounts_cache
+
     # Ensure the data directory exists
     ACCOUNTS_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    plaintext = json.dumps(accounts, indent=2, ensure_ascii=False).encode("utf-8")
+    plaintext = fastjson.dumps(accounts, indent=True)
     blob = encrypt(plaintext, master_password)
 
-    # Write to temp file first, then rename (atomic on POSIX)
+    # Write to temp file first, then rename (atomic on POSIX).  The file is
+    # created owner-only (0o600) up front; the mode survives the rename, so
+    # no chmod is needed.  A leftover temp file from an interrupted save is
+    # removed first and O_EXCL guarantees a fresh file, because os.open()
+    # only applies the mode when it creates the file.  Windows ignores the
+    # mode (ACLs apply instead).
     tmp_path = ACCOUNTS_FILE.with_suffix(".tmp")
-    tmp_path.write_bytes(blob)
-    _set_file_permissions(tmp_path)
-    tmp_path.replace(ACCOUNTS_FILE)
-    _set_file_permissions(ACCOUNTS_FILE)
+    try:
+        os.unlink(tmp_path)
+    except FileNotFoundError:
+        pass
+    fd = os.open(
+        tmp_path,
+        os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+        0o600,
+    )
+    with os.fdopen(fd, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+        # rename keeps inode, mtime and size, so this is the final file's key
+        key = _cache_key(os.fstat(f.fileno()), master_password)
+    os.replace(tmp_path, ACCOUNTS_FILE)
+    _accounts_cache = (key, copy.deepcopy(accounts))
 
     logger.info("Saved %d account(s) to encrypted storage.", len(accounts))
 
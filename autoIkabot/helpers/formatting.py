@@ -3,9 +3,13 @@
 Ported from ikabot's helpers/varios.py.
 """
 
+import functools
+import math
 import time
 from datetime import datetime
 
+_COMMA_TO_DOT = str.maketrans(",", ".")
+
 
 def addThousandSeparator(num, character: str = ".") -> str:
     """Format a number with thousand separators.
@@ -22,7 +26,12 @@ def addThousandSeparator(num, character: str = ".") -> str:
     str
         Formatted string (e.g. 3000 -> "3.000").
     """
-    return "{0:,}".format(int(num)).replace(",", character)
+    formatted = format(int(num), ",")
+    if character == ",":
+        return formatted
+    if character == ".":
+        return formatted.translate(_COMMA_TO_DOT)
+    return formatted.replace(",", character)
 
 
 def getDateTime(timestamp=None) -> str:
@@ -39,7 +48,15 @@ def getDateTime(timestamp=None) -> str:
         Formatted datetime string.
     """
     timestamp = timestamp if timestamp is not None else time.time()
-    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d_%H-%M-%S")
+    # floor, not int(): fromtimestamp() floors, int() truncates toward zero
+    return _format_timestamp(math.floor(timestamp))
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_timestamp(seconds: int) -> str:
+    """Format a whole-second timestamp; memoized, as log lines within the
+    same second ask for the same string."""
+    return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d_%H-%M-%S")
 
 
 def daysHoursMinutes(totalSeconds) -> str:
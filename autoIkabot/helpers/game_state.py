@@ -11,15 +11,13 @@ Provides:
 
 import json
 import re
-from decimal import Decimal, getcontext
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Union
 
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-getcontext().prec = 30
-
 
 class GameState:
     """Central game state snapshot parsed from updateGlobalData.
@@ -68,6 +66,30 @@ class GameState:
         Raw headerData dict from the JSON response.
     """
 
+    # Fixed field set: no per-instance __dict__, direct slot access
+    __slots__ = (
+        "gold",
+        "gold_production",
+        "income",
+        "upkeep",
+        "scientists_upkeep",
+        "resources",
+        "storage",
+        "resource_production",
+        "tradegood_production",
+        "produced_tradegood",
+        "wine_consumption",
+        "free_transporters",
+        "max_transporters",
+        "free_freighters",
+        "max_freighters",
+        "citizens",
+        "population",
+        "current_city_id",
+        "server_time",
+        "raw",
+    )
+
     def __init__(self):
         self.gold: int = 0
         self.gold_production: int = 0
@@ -91,6 +113,93 @@ class GameState:
         self.raw: Dict[str, Any] = {}
 
 
+# headerData keys for [wood, wine, marble, crystal, sulfur]
+_RESOURCE_KEYS = ("resource", "1", "2", "3", "4")
+
+
+def _to_int(value: Any, default: int = 0) -> int:
+    """Coerce a headerData number (int, float or numeric string) to int.
+
+    Fractional values are truncated toward zero; None gives ``default``.
+    """
+    if value is None:
+        return default
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))  # e.g. "1234.5"
+
+
+# Structural characters for the headerData brace walk
+_RE_JSON_STRUCTURE = re.compile(r'[{}"\\]')
+
+
+def _slice_json_object(data: str, start: int) -> Optional[str]:
+    """Return the JSON object starting at ``data[start]`` (a ``{``).
+
+    Tracks brace depth, ignoring braces inside strings.
+
+    Returns
+    -------
+    str or None
+        The object's source text, or None if it is not closed.
+    """
+    depth = 0
+    in_string = False
+    pos = start
+    while True:
+        match = _RE_JSON_STRUCTURE.search(data, pos)
+        if match is None:
+            return None
+        char = match.group()
+        pos = match.end()
+        if in_string:
+            if char == "\\":
+                pos += 1  # skip the escaped character
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return data[start:pos]
+
+
+def _parse_header_data(data: str) -> Optional[Dict[str, Any]]:
+    """Decode only the headerData object of an updateGlobalData response.
+
+    The full response also carries every pushed view update (often large
+    HTML fragments) which parse_global_data never looks at.
+
+    Returns
+    -------
+    dict or None
+        The headerData dict, or None if it could not be isolated (the
+        caller then falls back to parsing the whole response).
+    """
+    key = data.find('"headerData":')
+    if key < 0:
+        return None
+    start = key + len('"headerData":')
+    while start < len(data) and data[start] in " \t\r\n":
+        start += 1
+    if not data.startswith("{", start):
+        return None
+    raw = _slice_json_object(data, start)
+    if raw is None:
+        return None
+    try:
+        header = fastjson.loads(raw)
+    except ValueError:
+        return None
+    return header if isinstance(header, dict) else None
+
+
 def parse_global_data(data: str) -> GameState:
     """Parse the response from ``?view=updateGlobalData&ajax=1``.
 
@@ -110,66 +219,51 @@ def parse_global_data(data: str) -> GameState:
     """
     state = GameState()
 
-    try:
-        json_data = json.loads(data, strict=False)
-        header = json_data[0][1]["headerData"]
-        state.raw = header
-    except (json.JSONDecodeError, IndexError, KeyError, TypeError) as e:
-        logger.warning("Could not parse updateGlobalData response: %s", e)
-        return state
+    header = _parse_header_data(data)
+    if header is None:
+        try:
+            json_data = fastjson.loads(data)
+            header = json_data[0][1]["headerData"]
+        except (json.JSONDecodeError, IndexError, KeyError, TypeError) as e:
+            logger.warning("Could not parse updateGlobalData response: %s", e)
+            return state
+        if not isinstance(header, dict):
+            logger.warning("updateGlobalData response has no headerData object")
+            return state
+    state.raw = header
 
     # Gold
-    state.gold = int(Decimal(str(header.get("gold", 0))))
-    state.income = int(Decimal(str(header.get("income", 0))))
-    state.upkeep = int(Decimal(str(header.get("upkeep", 0))))
-    state.scientists_upkeep = int(Decimal(str(header.get("scientistsUpkeep", 0))))
-    state.gold_production = int(
-        Decimal(str(state.income))
-        + Decimal(str(state.upkeep))
-        + Decimal(str(state.scientists_upkeep))
-    )
+    state.gold = _to_int(header.get("gold"))
+    state.income = _to_int(header.get("income"))
+    state.upkeep = _to_int(header.get("upkeep"))
+    state.scientists_upkeep = _to_int(header.get("scientistsUpkeep"))
+    state.gold_production = state.income + state.upkeep + state.scientists_upkeep
 
-    # Resources from currentResources
+    # Resources from currentResources: [wood, wine, marble, crystal, sulfur]
     cr = header.get("currentResources", {})
-    state.resources = [
-        int(Decimal(str(cr.get("resource", 0)))),   # wood
-        int(Decimal(str(cr.get("1", 0)))),           # wine
-        int(Decimal(str(cr.get("2", 0)))),           # marble
-        int(Decimal(str(cr.get("3", 0)))),           # crystal
-        int(Decimal(str(cr.get("4", 0)))),           # sulfur
-    ]
+    state.resources = [_to_int(cr.get(k)) for k in _RESOURCE_KEYS]
 
     # Storage capacity from maxResources
     mr = header.get("maxResources", {})
-    state.storage = [
-        int(Decimal(str(mr.get("resource", 0)))),
-        int(Decimal(str(mr.get("1", 0)))),
-        int(Decimal(str(mr.get("2", 0)))),
-        int(Decimal(str(mr.get("3", 0)))),
-        int(Decimal(str(mr.get("4", 0)))),
-    ]
+    state.storage = [_to_int(mr.get(k)) for k in _RESOURCE_KEYS]
 
     # Production rates (per second from server → convert to per hour)
-    state.resource_production = float(
-        Decimal(str(header.get("resourceProduction", 0))) * 3600
-    )
-    state.tradegood_production = float(
-        Decimal(str(header.get("tradegoodProduction", 0))) * 3600
-    )
-    state.produced_tradegood = int(header.get("producedTradegood", 0))
+    state.resource_production = float(header.get("resourceProduction") or 0) * 3600
+    state.tradegood_production = float(header.get("tradegoodProduction") or 0) * 3600
+    state.produced_tradegood = _to_int(header.get("producedTradegood"))
 
     # Wine consumption
-    state.wine_consumption = int(header.get("wineSpendings", 0))
+    state.wine_consumption = _to_int(header.get("wineSpendings"))
 
     # Transport
-    state.free_transporters = int(header.get("freeTransporters", 0))
-    state.max_transporters = int(header.get("maxTransporters", 0))
-    state.free_freighters = int(header.get("freeFreighters", 0))
-    state.max_freighters = int(header.get("maxFreighters", 0))
+    state.free_transporters = _to_int(header.get("freeTransporters"))
+    state.max_transporters = _to_int(header.get("maxTransporters"))
+    state.free_freighters = _to_int(header.get("freeFreighters"))
+    state.max_freighters = _to_int(header.get("maxFreighters"))
 
     # Population
-    state.citizens = int(Decimal(str(cr.get("citizens", 0))))
-    state.population = int(Decimal(str(cr.get("population", 0))))
+    state.citizens = _to_int(cr.get("citizens"))
+    state.population = _to_int(cr.get("population"))
 
     # Current city
     related = header.get("relatedCity", {})
@@ -178,15 +272,47 @@ def parse_global_data(data: str) -> GameState:
     return state
 
 
-def parse_resource_bar(html: str) -> Dict[str, int]:
+# Resource bar element id suffix (js_GlobalMenu_<suffix>) -> result key
+_BAR_FIELDS = {
+    "gold": "gold",
+    "wood": "wood",
+    "wine": "wine",
+    "marble": "marble",
+    "crystal": "crystal",
+    "sulfur": "sulfur",
+    "max_wood": "max_wood",
+    "max_wine": "max_wine",
+    "max_marble": "max_marble",
+    "max_crystal": "max_crystal",
+    "max_sulfur": "max_sulfur",
+    "citizens": "citizens",
+    "population": "population",
+    "freeTransporters": "free_transporters",
+    "maxTransporters": "max_transporters",
+    "freeFreighters": "free_freighters",
+    "maxFreighters": "max_freighters",
+    "resourceProduction": "resource_production",
+    "income": "income",
+    "upkeep": "upkeep",
+}
+# One pass over the page finds every field.  A bytes twin lets raw
+# response bodies be scanned without decoding the whole page first.
+_RESOURCE_BAR_PATTERN = r'js_GlobalMenu_(' + "|".join(_BAR_FIELDS) + r')">([\d,.]+)<'
+_RE_RESOURCE_BAR = re.compile(_RESOURCE_BAR_PATTERN)
+_RE_RESOURCE_BAR_BYTES = re.compile(_RESOURCE_BAR_PATTERN.encode())
+_BAR_SEPARATORS = str.maketrans("", "", ",.")
+_BAR_SEPARATORS_BYTES = b",."
+
+
+def parse_resource_bar(html: Union[str, bytes]) -> Dict[str, int]:
     """Parse resource bar values from any game page HTML.
 
     Uses the element IDs from the top navigation bar.
 
     Parameters
     ----------
-    html : str
-        Game page HTML.
+    html : str or bytes
+        Game page HTML, decoded or as the raw response body.
 
     Returns
     -------
@@ -196,67 +322,93 @@ def parse_resource_bar(html: str) -> Dict[str, int]:
         citizens, population, free_transporters, max_transporters,
         free_freighters, max_freighters, resource_production, income, upkeep.
     """
-    result = {}
-
-    patterns = {
-        "gold": r'js_GlobalMenu_gold">([\d,.]+)<',
-        "wood": r'js_GlobalMenu_wood">([\d,.]+)<',
-        "wine": r'js_GlobalMenu_wine">([\d,.]+)<',
-        "marble": r'js_GlobalMenu_marble">([\d,.]+)<',
-        "crystal": r'js_GlobalMenu_crystal">([\d,.]+)<',
-        "sulfur": r'js_GlobalMenu_sulfur">([\d,.]+)<',
-        "max_wood": r'js_GlobalMenu_max_wood">([\d,.]+)<',
-        "max_wine": r'js_GlobalMenu_max_wine">([\d,.]+)<',
-        "max_marble": r'js_GlobalMenu_max_marble">([\d,.]+)<',
-        "max_crystal": r'js_GlobalMenu_max_crystal">([\d,.]+)<',
-        "max_sulfur": r'js_GlobalMenu_max_sulfur">([\d,.]+)<',
-        "citizens": r'js_GlobalMenu_citizens">([\d,.]+)<',
-        "population": r'js_GlobalMenu_population">([\d,.]+)<',
-        "free_transporters": r'js_GlobalMenu_freeTransporters">([\d,.]+)<',
-        "max_transporters": r'js_GlobalMenu_maxTransporters">([\d,.]+)<',
-        "free_freighters": r'js_GlobalMenu_freeFreighters">([\d,.]+)<',
-        "max_freighters": r'js_GlobalMenu_maxFreighters">([\d,.]+)<',
-        "resource_production": r'js_GlobalMenu_resourceProduction">([\d,.]+)<',
-        "income": r'js_GlobalMenu_income">([\d,.]+)<',
-        "upkeep": r'js_GlobalMenu_upkeep">([\d,.]+)<',
-    }
-
-    for key, pattern in patterns.items():
-        match = re.search(pattern, html)
-        if match:
-            # Strip thousand separators (commas, dots, spaces)
-            digits = re.sub(r"[^\d]", "", match.group(1))
-            result[key] = int(digits) if digits else 0
+    raw = isinstance(html, (bytes, bytearray))
+    pattern = _RE_RESOURCE_BAR_BYTES if raw else _RE_RESOURCE_BAR
+    result = dict.fromkeys(_BAR_FIELDS.values(), 0)
+    seen = set()
+    for match in pattern.finditer(html):
+        name = match.group(1)
+        key = _BAR_FIELDS[name.decode("ascii") if raw else name]
+        if key in seen:
+            continue  # first occurrence wins, as with re.search
+        seen.add(key)
+        # Strip thousand separators (the match is only digits, commas, dots)
+        if raw:
+            digits = match.group(2).translate(None, _BAR_SEPARATORS_BYTES)
         else:
-            result[key] = 0
+            digits = match.group(2).translate(_BAR_SEPARATORS)
+        result[key] = int(digits) if digits else 0
+        if len(seen) == len(result):
+            break
 
     return result
 
 
-def parse_server_time(html: str) -> str:
+_SERVER_TIME_PATTERN = r'id="servertime"[^>]*>(.*?)</li>'
+_RE_SERVER_TIME = re.compile(_SERVER_TIME_PATTERN)
+_RE_SERVER_TIME_BYTES = re.compile(_SERVER_TIME_PATTERN.encode())
+
+
+def parse_server_time(html: Union[str, bytes]) -> str:
     """Extract server time from game HTML.
 
     The format is typically ``DD.MM.YYYY HH:MM:SS CET``.
 
     Parameters
     ----------
-    html : str
-        Game page HTML.
+    html : str or bytes
+        Game page HTML, decoded or as the raw response body.
 
     Returns
     -------
     str
         Server time string, or empty string if not found.
     """
-    match = re.search(r'id="servertime"[^>]*>(.*?)</li>', html)
+    if isinstance(html, (bytes, bytearray)):
+        match = _RE_SERVER_TIME_BYTES.search(html)
+        if match:
+            # Only the short matched group is decoded
+            return match.group(1).decode("utf-8", "replace").strip()
+        return ""
+    match = _RE_SERVER_TIME.search(html)
     if match:
         return match.group(1).strip()
     return ""
 
 
+# Thousands separators that appear in production cells: commas, ASCII
+# whitespace and the (narrow) no-break spaces some locales use
+_PRODUCTION_SEPARATORS = str.maketrans("", "", ", \t\n\r\x0b\x0c\xa0\u202f")
+
+
+_RE_LUXURY_TYPE = re.compile(r"tradegood&type=(\d+)")
+
+
+def _production_cell_re(cell_id: str) -> "re.Pattern[str]":
+    return re.compile(r'<td id="' + cell_id + r'"[^>]*>\s*([\d,\s]+)\s*</td>')
+
+
+_RE_WOOD_PRODUCTION = _production_cell_re("js_GlobalMenu_resourceProduction")
+# Luxury type (1=wine, 2=marble, 3=crystal, 4=sulfur) -> production cell
+_RE_LUXURY_PRODUCTION = {
+    1: _production_cell_re("js_GlobalMenu_production_wine"),
+    2: _production_cell_re("js_GlobalMenu_production_marble"),
+    3: _production_cell_re("js_GlobalMenu_production_crystal"),
+    4: _production_cell_re("js_GlobalMenu_production_sulfur"),
+}
+
+
+def _digits_to_int(num_str: str) -> int:
+    """Strip thousands separators from a production figure and parse it."""
+    digits = num_str.translate(_PRODUCTION_SEPARATORS)
+    if not digits.isdecimal():
+        digits = "".join(c for c in digits if c.isdecimal())  # rare separators
+    return int(digits or "0")
+
+
 def getProductionPerHour(
     session, city_id: str
-) -> Tuple[Decimal, Decimal, int]:
+) -> Tuple[int, int, int]:
     """Get wood and luxury production rates for a city.
 
     Parameters
@@ -268,50 +420,36 @@ def getProductionPerHour(
 
     Returns
     -------
-    tuple[Decimal, Decimal, int]
+    tuple[int, int, int]
         (wood_production_per_hour, luxury_production_per_hour, luxury_type).
     """
-    resource_search_pool = {
-        1: "js_GlobalMenu_production_wine",
-        2: "js_GlobalMenu_production_marble",
-        3: "js_GlobalMenu_production_crystal",
-        4: "js_GlobalMenu_production_sulfur",
-    }
-
     from autoIkabot.config import CITY_URL
 
     html = session.get(CITY_URL + str(city_id))
 
-    luxury_type_match = re.search(r"tradegood&type=(\d+)", html)
+    luxury_type_match = _RE_LUXURY_TYPE.search(html)
     if not luxury_type_match:
         logger.warning("Could not determine luxury type for city %s", city_id)
-        return Decimal(0), Decimal(0), 0
+        return 0, 0, 0
 
     luxury_type = int(luxury_type_match.group(1))
 
-    production_pattern = r'<td id="{}"[^>]*>\s*([\d,\s]+)\s*</td>'
-
-    def clean_number(num_str: str) -> int:
-        return int(re.sub(r"[^\d]", "", num_str))
-
-    wood_match = re.search(
-        production_pattern.format("js_GlobalMenu_resourceProduction"), html
-    )
-    luxury_match = re.search(
-        production_pattern.format(resource_search_pool.get(luxury_type, "")),
-        html,
-    )
+    wood_match = _RE_WOOD_PRODUCTION.search(html)
+    luxury_pattern = _RE_LUXURY_PRODUCTION.get(luxury_type)
+    luxury_match = luxury_pattern.search(html) if luxury_pattern else None
 
-    wood_prod = clean_number(wood_match.group(1)) if wood_match else 0
-    luxury_prod = clean_number(luxury_match.group(1)) if luxury_match else 0
+    wood_prod = _digits_to_int(wood_match.group(1)) if wood_match else 0
+    luxury_prod = _digits_to_int(luxury_match.group(1)) if luxury_match else 0
 
-    return Decimal(wood_prod), Decimal(luxury_prod), luxury_type
+    return wood_prod, luxury_prod, luxury_type
 
 
 def fetch_game_state(session, city_id: Optional[str] = None) -> GameState:
     """Fetch and parse the current game state for a city.
 
     Navigates to the city (if specified) then calls updateGlobalData.
+    The server time is read from the city page, so a city switch costs
+    two requests rather than three.
 
     Parameters
     ----------
@@ -327,14 +465,18 @@ def fetch_game_state(session, city_id: Optional[str] = None) -> GameState:
     """
     from autoIkabot.config import CITY_URL
 
+    html = ""
     if city_id:
-        session.get(CITY_URL + str(city_id), no_index=True)
+        html = session.get(CITY_URL + str(city_id), no_index=True)
 
     data = session.get("view=updateGlobalData&ajax=1", no_index=True)
     state = parse_global_data(data)
 
-    # Also try to get server time from the HTML
-    html = session.get()
-    state.server_time = parse_server_time(html)
+    # The city page already carries the server time; only fetch the
+    # current page when there was no city switch or it lacked the clock
+    server_time = parse_server_time(html) if html else ""
+    if not server_time:
+        server_time = parse_server_time(session.get())
+    state.server_time = server_time
 
     return state
@@ -3,17 +3,55 @@
 Ported from ikabot's helpers/naval.py and helpers/pedirInfo.py.
 """
 
-import json
 import random
 import re
 import time
+import weakref
+from typing import Tuple
 
 from autoIkabot.config import ACTION_REQUEST_PLACEHOLDER
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.logging import get_logger
 from autoIkabot.utils.process import sleep_with_heartbeat
 
 logger = get_logger(__name__)
 
+_RE_FREE_TRANSPORTERS = re.compile(r'GlobalMenu_freeTransporters">(\d+)<')
+_RE_FREE_FREIGHTERS = re.compile(r'GlobalMenu_freeFreighters">(\d+)<')
+_RE_CURRENT_CITY_ID = re.compile(r"currentCityId:\s(\d+),")
+_RE_SHIP_CAPACITY = re.compile(
+    r'singleTransporterCapacity":(\d+),"singleFreighterCapacity":(\d+)'
+)
+
+# Ship counts are read from the current page, which callers tend to fetch
+# several times in a row (free ships, then freighters, then the fleet wait
+# time).  The page is reused for a couple of seconds; routing.sendGoods()
+# drops it as soon as ships are dispatched.
+_PAGE_CACHE_TTL = 2.0  # seconds
+# session -> (monotonic, html); weak keys so entries go with their session
+_page_cache: "weakref.WeakKeyDictionary[object, Tuple[float, str]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _current_page(session) -> str:
+    """Return the current game page, reusing one fetched < _PAGE_CACHE_TTL ago."""
+    now = time.monotonic()
+    cached = _page_cache.get(session)
+    if cached is not None and now - cached[0] < _PAGE_CACHE_TTL:
+        return cached[1]
+    html = session.get()
+    _page_cache[session] = (now, html)
+    return html
+
+
+def invalidate_page_cache(session) -> None:
+    """Forget the cached page so the next ship count is fetched fresh.
+
+    Call after any action that changes ship availability or the current city.
+    """
+    _page_cache.pop(session, None)
+
 
 def getAvailableShips(session) -> int:
     """Return the number of free merchant (trade) ships.
@@ -28,8 +66,8 @@ def getAvailableShips(session) -> int:
     int
         Number of available trade ships.
     """
-    html = session.get()
-    match = re.search(r'GlobalMenu_freeTransporters">(\d+)<', html)
+    html = _current_page(session)
+    match = _RE_FREE_TRANSPORTERS.search(html)
     return int(match.group(1)) if match else 0
 
 
@@ -46,8 +84,8 @@ def getAvailableFreighters(session) -> int:
     int
         Number of available freighters.
     """
-    html = session.get()
-    match = re.search(r'GlobalMenu_freeFreighters">(\d+)<', html)
+    html = _current_page(session)
+    match = _RE_FREE_FREIGHTERS.search(html)
     return int(match.group(1)) if match else 0
 
 
@@ -65,17 +103,11 @@ def getShipCapacity(session) -> tuple:
         (trade_ship_capacity, freighter_capacity).
     """
     html = session.post("view=merchantNavy")
-    try:
-        ship_capacity = html.split('singleTransporterCapacity":')[1].split(
-            ',"singleFreighterCapacity'
-        )[0]
-        freighter_capacity = html.split('singleFreighterCapacity":')[1].split(
-            ',"draftEffect'
-        )[0]
-        return int(ship_capacity), int(freighter_capacity)
-    except (IndexError, ValueError):
+    match = _RE_SHIP_CAPACITY.search(html)
+    if match is None:
         logger.warning("Could not parse ship capacity, using defaults")
         return 500, 500
+    return int(match.group(1)), int(match.group(2))
 
 
 def getMinimumWaitingTime(session) -> int:
@@ -93,8 +125,8 @@ def getMinimumWaitingTime(session) -> int:
     int
         Seconds to wait (0 if no fleets in transit).
     """
-    html = session.get()
-    city_id_match = re.search(r"currentCityId:\s(\d+),", html)
+    html = _current_page(session)
+    city_id_match = _RE_CURRENT_CITY_ID.search(html)
     if city_id_match is None:
         return 0
     city_id = city_id_match.group(1)
@@ -106,18 +138,18 @@ def getMinimumWaitingTime(session) -> int:
     posted = session.post(url)
 
     try:
-        postdata = json.loads(posted, strict=False)
+        postdata = fastjson.loads(posted)
         movements = postdata[1][1][2]["viewScriptParams"][
             "militaryAndFleetMovements"
         ]
-        current_time = int(postdata[0][1]["time"])
-        delivered_times = []
-        for mv in movements:
-            if mv.get("isOwnArmyOrFleet"):
-                remaining = int(mv["eventTime"]) - current_time
-                delivered_times.append(remaining)
-        if delivered_times:
-            return min(delivered_times) + random.randint(0, 60)
+        # Track the earliest own arrival directly; no list of times
+        earliest = min(
+            (int(mv["eventTime"]) for mv in movements if mv.get("isOwnArmyOrFleet")),
+            default=None,
+        )
+        if earliest is not None:
+            current_time = int(postdata[0][1]["time"])
+            return earliest - current_time + random.randint(0, 60)
     except Exception:
         logger.warning("Could not parse fleet movements for wait time")
 
@@ -149,6 +181,8 @@ def waitForArrival(session, useFreighters: bool = False, max_wait: int = 7200) -
         logger.info("No ships available, waiting %ds", wait_time)
         session.setStatus(f"[WAITING] No {ship_name} available, retrying in {wait_time}s")
         sleep_with_heartbeat(session, wait_time, interval=30)
+        # The page cached before the sleep says no ships; fetch it fresh
+        invalidate_page_cache(session)
         available = getter(session)
 
     session.setStatus(f"[PROCESSING] {available} {ship_name} available")
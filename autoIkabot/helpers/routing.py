@@ -5,18 +5,21 @@ Ported from ikabot's helpers/planRoutes.py.
 
 import json
 import math
+import random
 import time
-from decimal import Decimal
 
 from autoIkabot.config import ACTION_REQUEST_PLACEHOLDER, CITY_URL, MATERIALS_NAMES
 from autoIkabot.helpers.game_parser import getCity
 from autoIkabot.helpers.naval import (
+    _RE_CURRENT_CITY_ID,
     getAvailableShips,
     getAvailableFreighters,
     getMinimumWaitingTime,
     getShipCapacity,
+    invalidate_page_cache,
     waitForArrival,
 )
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.logging import get_logger
 from autoIkabot.utils.process import sleep_with_heartbeat
 
@@ -25,6 +28,50 @@ logger = get_logger(__name__)
 # Maximum retries for sendGoods before giving up
 _SEND_GOODS_MAX_RETRIES = 20
 
+# Back-off between sendGoods retries: 5s doubling per failed attempt, capped
+_SEND_GOODS_BACKOFF_BASE = 5  # seconds
+_SEND_GOODS_BACKOFF_MAX = 300  # seconds
+
+# Static part of the loadTransportersWithFreight request
+_LOAD_FREIGHT_PARAMS = {
+    "action": "transportOperations",
+    "function": "loadTransportersWithFreight",
+    "oldView": "",
+    "position": "",
+    "avatar2Name": "",
+    "city2Name": "",
+    "type": "",
+    "activeTab": "",
+    "transportDisplayPrice": "0",
+    "premiumTransporter": "0",
+    "capacity": "5",
+    "max_capacity": "5",
+    "jetPropulsion": "0",
+    "backgroundView": "city",
+    "templateView": "transport",
+    "currentTab": "tabSendTransporter",
+    "actionRequest": ACTION_REQUEST_PLACEHOLDER,
+    "ajax": "1",
+}
+
+
+def _retry_delay(failures: int) -> float:
+    """Return the exponential back-off delay (with jitter) for a retry.
+
+    Parameters
+    ----------
+    failures : int
+        Consecutive failed attempts so far (0 for the first retry).
+
+    Returns
+    -------
+    float
+        Seconds to sleep: ``min(5 * 2**failures, 300)`` plus up to 2s of
+        jitter so parallel shipments don't retry in lockstep.
+    """
+    delay = min(_SEND_GOODS_BACKOFF_BASE * (2 ** failures), _SEND_GOODS_BACKOFF_MAX)
+    return delay + random.uniform(0, 2)
+
 
 def sendGoods(
     session,
@@ -54,71 +101,62 @@ def sendGoods(
     useFreighters : bool
         Use freighters instead of trade ships.
     """
+    origin_city_id = str(origin_city_id)
+
+    # Transport request fields that stay the same across attempts
+    base_data = {
+        **_LOAD_FREIGHT_PARAMS,
+        "destinationCityId": str(destination_city_id),
+        "islandId": str(island_id),
+        "currentCityId": origin_city_id,
+    }
+    if useFreighters:
+        base_data["usedFreightersShips"] = ships
+        base_data["transporters"] = "0"
+    else:
+        base_data["transporters"] = ships
+
+    failures = 0
     for attempt in range(_SEND_GOODS_MAX_RETRIES):
         try:
-            html = session.get()
-            current_city = getCity(html)
-            city = getCity(session.get(CITY_URL + str(origin_city_id)))
+            # Read the selected city fresh each attempt; it can change
+            # during the waits between attempts.  Only its id is needed,
+            # so skip the full getCity parse of that page.
+            current_city_match = _RE_CURRENT_CITY_ID.search(session.get())
+            if current_city_match is None:
+                raise ValueError("current city id not found in page")
+            current_city_id = current_city_match.group(1)
+            city = getCity(session.get(CITY_URL + origin_city_id))
         except Exception as e:
             logger.warning("sendGoods: failed to fetch city data (attempt %d): %s", attempt + 1, e)
             sleep_with_heartbeat(session, 30)
             continue
 
-        curr_id = current_city["id"]
-
         # Switch to origin city
         data = {
             "action": "header",
             "function": "changeCurrentCity",
             "actionRequest": ACTION_REQUEST_PLACEHOLDER,
             "oldView": "city",
-            "cityId": str(origin_city_id),
+            "cityId": origin_city_id,
             "backgroundView": "city",
-            "currentCityId": curr_id,
+            "currentCityId": current_city_id,
             "ajax": "1",
         }
         session.post(params=data)
 
-        # Build transport request
-        data = {
-            "action": "transportOperations",
-            "function": "loadTransportersWithFreight",
-            "destinationCityId": str(destination_city_id),
-            "islandId": str(island_id),
-            "oldView": "",
-            "position": "",
-            "avatar2Name": "",
-            "city2Name": "",
-            "type": "",
-            "activeTab": "",
-            "transportDisplayPrice": "0",
-            "premiumTransporter": "0",
-            "capacity": "5",
-            "max_capacity": "5",
-            "jetPropulsion": "0",
-            "backgroundView": "city",
-            "currentCityId": str(origin_city_id),
-            "templateView": "transport",
-            "currentTab": "tabSendTransporter",
-            "actionRequest": ACTION_REQUEST_PLACEHOLDER,
-            "ajax": "1",
-        }
-
-        if useFreighters:
-            data["usedFreightersShips"] = ships
-            data["transporters"] = "0"
-        else:
-            data["transporters"] = ships
-
-        # Add resource amounts
+        # Only the cargo depends on the freshly read city
+        data = base_data.copy()
         for i in range(len(send)):
             if city["availableResources"][i] > 0:
                 key = "cargo_resource" if i == 0 else f"cargo_tradegood{i}"
                 data[key] = send[i]
 
         resp = session.post(params=data)
+        # Ships (and possibly the current city) changed; don't reuse the page
+        invalidate_page_cache(session)
         try:
-            resp_data = json.loads(resp, strict=False)
+            resp_data = fastjson.loads(resp)
             if resp_data[3][1][0]["type"] == 10:
                 return  # Success
             elif resp_data[3][1][0]["type"] == 11:
@@ -128,10 +166,13 @@ def sendGoods(
                     wait_time = 60
                 logger.info("Ships busy, waiting %ds before retry", wait_time)
                 sleep_with_heartbeat(session, wait_time)
+                # The request itself went through; only the ships were busy
+                failures = 0
         except (json.JSONDecodeError, IndexError, KeyError):
             logger.warning("Unexpected response from sendGoods (attempt %d), retrying", attempt + 1)
 
-        sleep_with_heartbeat(session, 5)
+        sleep_with_heartbeat(session, _retry_delay(failures))
+        failures += 1
 
     raise Exception(f"sendGoods failed after {_SEND_GOODS_MAX_RETRIES} attempts")
 
@@ -157,7 +198,9 @@ def executeRoutes(session, routes: list, useFreighters: bool = False) -> None:
         (origin_city, destination_city, island_id, *toSend) = route
         destination_city_id = destination_city["id"]
 
-        while sum(toSend) > 0:
+        # toSend never goes negative (each amount is clamped to what is
+        # wanted), so OR-ing the five counts is non-zero iff any remain
+        while toSend[0] | toSend[1] | toSend[2] | toSend[3] | toSend[4]:
             ships_available = waitForArrival(session, useFreighters)
             if useFreighters:
                 storage_in_ships = ships_available * freighter_capacity
@@ -173,35 +216,27 @@ def executeRoutes(session, routes: list, useFreighters: bool = False) -> None:
             if not foreign:
                 storage_in_city = destination_city["freeSpaceForResources"]
 
+            # Per resource: clamp to what the origin has, what is still
+            # wanted and the free space at the destination, then to the
+            # ship space left after the earlier resources
+            city_space = storage_in_city if not foreign else (math.inf,) * len(toSend)
             send = []
-            for i in range(len(toSend)):
-                if not foreign:
-                    min_val = min(
-                        origin_city["availableResources"][i],
-                        toSend[i],
-                        storage_in_ships,
-                        storage_in_city[i],
-                    )
-                else:
-                    min_val = min(
-                        origin_city["availableResources"][i],
-                        toSend[i],
-                        storage_in_ships,
-                    )
-                send.append(min_val)
-                storage_in_ships -= send[i]
-                toSend[i] -= send[i]
-
-            resources_to_send = sum(send)
+            for available, wanted, space in zip(
+                origin_city["availableResources"], toSend, city_space
+            ):
+                amount = min(available, wanted, space, storage_in_ships)
+                send.append(amount)
+                storage_in_ships -= amount
+            toSend = [wanted - sent for wanted, sent in zip(toSend, send)]
+
+            resources_to_send = send[0] + send[1] + send[2] + send[3] + send[4]
             if resources_to_send == 0:
                 logger.info("No space available, waiting 1 hour")
                 sleep_with_heartbeat(session, 60 * 60)
                 continue
 
             capacity = freighter_capacity if useFreighters else ship_capacity
-            ships_needed = int(
-                math.ceil(Decimal(resources_to_send) / Decimal(capacity))
-            )
+            ships_needed = -(-resources_to_send // capacity)  # ceil division
             sendGoods(
                 session,
                 origin_city["id"],
@@ -7,15 +7,17 @@ Ported from ikabot's function/activateMiracle.py, adapted for
 autoIkabot's background module architecture.
 """
 
-import json
 import os
 import re
 import sys
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from autoIkabot.config import (
     ACTION_REQUEST_PLACEHOLDER,
     CITY_URL,
+    GAME_FETCH_MAX_CONCURRENCY,
     ISLAND_URL,
 )
 from autoIkabot.helpers.formatting import daysHoursMinutes, getDateTime
@@ -26,6 +28,7 @@ from autoIkabot.helpers.game_parser import (
     getIslandsIds,
 )
 from autoIkabot.ui.prompts import ReturnToMainMenu, banner, enter, read
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.logging import get_logger
 from autoIkabot.utils.process import (
     report_critical_error,
@@ -41,6 +44,19 @@ MODULE_SECTION = "Dailies/Regular"
 MODULE_NUMBER = 5
 MODULE_DESCRIPTION = "Activate a miracle on repeat"
 
+# Re-poll interval when the temple view gives no countdown: starts at 30s
+# and doubles on each consecutive miss, capped at 15 minutes
+_POLL_BACKOFF_INITIAL = 30  # seconds
+_POLL_BACKOFF_MAX = 900  # seconds
+_POLL_BACKOFF_MULT = 2
+
+# Wonder level in the temple view.  The fragment comes out of the JSON parser,
+# so its line break is a real newline (matched by \s*); a literal "\n"
+# is still accepted in case the server ever double-escapes it.
+_RE_WONDER_LEVEL = re.compile(
+    r'<div id="wonderLevelDisplay"[^>]*>(?:\\n)?\s*(\d+)\s*</div>'
+)
+
 
 # ---------------------------------------------------------------------------
 # Helper functions
@@ -64,28 +80,35 @@ def obtainMiraclesAvailable(session):
         ``ciudad``, ``available``, and optionally ``available_in``.
     """
     idsIslands = getIslandsIds(session)
-    islands = []
-    for idIsland in idsIslands:
-        html = session.get(ISLAND_URL + idIsland)
-        island = getIsland(html)
+    # Island views are independent reads, so overlap their round trips.
+    # The per-city temple queries below stay sequential: each one depends
+    # on the city switch and actionRequest token of the request before it.
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(GAME_FETCH_MAX_CONCURRENCY, len(idsIslands)))
+    ) as pool:
+        islands = list(pool.map(
+            lambda idIsland: getIsland(session.get(ISLAND_URL + idIsland)),
+            idsIslands,
+        ))
+    islands_by_id = {}
+    # Keyed the way city["coords"] is formatted, e.g. "[12:34] "
+    islands_by_coords = {}
+    for island in islands:
         island["activable"] = False
-        islands.append(island)
+        islands_by_id.setdefault(island["id"], island)
+        islands_by_coords.setdefault("[{}:{}] ".format(island["x"], island["y"]), island)
+    activated_wonders = set()
 
     ids, cities = getIdsOfCities(session)
     for city_id in cities:
         city = cities[city_id]
         # Get the wonder for this city's island
-        matching = [
-            island["wonder"]
-            for island in islands
-            if city.get("coords") == "[{}:{}] ".format(island["x"], island["y"])
-        ]
-        if not matching:
+        coords_island = islands_by_coords.get(city.get("coords"))
+        if coords_island is None:
             continue
-        wonder = matching[0]
 
         # Skip if we already have this wonder type covered
-        if wonder in [island["wonder"] for island in islands if island["activable"]]:
+        if coords_island["wonder"] in activated_wonders:
             continue
 
         html = session.get(CITY_URL + str(city["id"]))
@@ -113,13 +136,10 @@ def obtainMiraclesAvailable(session):
             "ajax": "1",
         }
         data = session.post(params=params)
-        data = json.loads(data, strict=False)
+        data = fastjson.loads(data)
 
         html_fragment = data[1][1][1]
-        match = re.search(
-            r'<div id="wonderLevelDisplay"[^>]*>\\n\s*(\d+)\s*</div>',
-            html_fragment,
-        )
+        match = _RE_WONDER_LEVEL.search(html_fragment)
         level = int(match.group(1)) if match else 0
 
         wonder_data = data[2][1]
@@ -135,15 +155,15 @@ def obtainMiraclesAvailable(session):
                     break
 
         # Annotate the matching island
-        for island in islands:
-            if island["id"] == city["islandId"]:
-                island["activable"] = True
-                island["ciudad"] = city
-                island["wonderActivationLevel"] = level
-                island["available"] = available
-                if not available and enddate is not None:
-                    island["available_in"] = int(float(enddate)) - int(float(currentdate))
-                break
+        island = islands_by_id.get(city["islandId"])
+        if island is not None:
+            island["activable"] = True
+            island["ciudad"] = city
+            island["wonderActivationLevel"] = level
+            island["available"] = available
+            if not available and enddate is not None:
+                island["available_in"] = int(float(enddate)) - int(float(currentdate))
+            activated_wonders.add(island["wonder"])
 
     return [island for island in islands if island["activable"]]
 
@@ -173,7 +193,7 @@ def activateMiracleHttpCall(session, island):
         "ajax": "1",
     }
     response = session.post(params=params)
-    return json.loads(response, strict=False)
+    return fastjson.loads(response)
 
 
 def chooseIsland(islands):
@@ -211,18 +231,67 @@ def chooseIsland(islands):
 # Background loop functions
 # ---------------------------------------------------------------------------
 
-def wait_for_miracle(session, island):
+def _cooldown_seconds(wonder_data):
+    """Return the remaining cooldown in a temple view's wonder data.
+
+    Parameters
+    ----------
+    wonder_data : dict
+        The ``[2][1]`` element of a temple view or activation response.
+
+    Returns
+    -------
+    int or None
+        Seconds until the wonder can be activated again, or None if the
+        response carries no countdown.
+    """
+    for value in wonder_data.values():
+        if isinstance(value, dict) and "countdown" in value:
+            countdown = value["countdown"]
+            return int(float(countdown["enddate"])) - int(float(countdown["currentdate"]))
+    return None
+
+
+def wait_for_miracle(session, island, wait_time=None):
     """Block until the miracle is ready to be activated.
 
-    Polls the temple view endpoint periodically and returns once the
-    wonder button state becomes ``"enabled"``.
+    Polls the temple view endpoint and returns once the wonder button
+    state becomes ``"enabled"``.  Once a cooldown countdown is known the
+    loop sleeps straight to its end and only then re-checks, so a wait
+    normally costs a single confirmation request.  When the server omits
+    the countdown, the re-poll interval backs off exponentially (30s up to
+    15 minutes) and resets once a countdown is seen again.
 
     Parameters
     ----------
     session : Session
     island : dict
+    wait_time : int, optional
+        Cooldown already known to the caller (e.g. from the activation
+        response), in seconds.  Skips the initial temple view request.
     """
+    backoff = _POLL_BACKOFF_INITIAL
+    deadline = None
     while True:
+        if wait_time is not None:
+            deadline = time.monotonic() + wait_time
+            session.setStatus(
+                "[WAITING] Miracle {} activated. Available at: {}".format(
+                    island["wonderName"], getDateTime(time.time() + wait_time)
+                )
+            )
+            wait_time = None
+
+        if deadline is not None:
+            # Don't poll while the countdown is known; verify once at its end
+            remaining = max(deadline - time.monotonic(), 0)
+            logger.debug(
+                "Waiting %d seconds to activate miracle %s",
+                remaining + 5, island["wonderName"],
+            )
+            sleep_with_heartbeat(session, remaining + 5)
+            deadline = None
+
         params = {
             "view": "temple",
             "cityId": island["ciudad"]["id"],
@@ -233,7 +302,7 @@ def wait_for_miracle(session, island):
             "ajax": "1",
         }
         temple_response = session.post(params=params)
-        temple_response = json.loads(temple_response, strict=False)
+        temple_response = fastjson.loads(temple_response)
         try:
             temple_response = temple_response[2][1]
         except (IndexError, KeyError, TypeError):
@@ -241,34 +310,24 @@ def wait_for_miracle(session, island):
             sleep_with_heartbeat(session, 60)
             continue
 
-        wait_time = None
-        for elem in temple_response:
-            if isinstance(temple_response[elem], dict) and "countdown" in temple_response[elem]:
-                enddate = temple_response[elem]["countdown"]["enddate"]
-                currentdate = temple_response[elem]["countdown"]["currentdate"]
-                wait_time = int(float(enddate)) - int(float(currentdate))
-                next_activation_time = __import__("time").time() + wait_time
-                session.setStatus(
-                    "[WAITING] Miracle {} activated. Available at: {}".format(
-                        island["wonderName"], getDateTime(next_activation_time)
-                    )
-                )
-                break
+        wait_time = _cooldown_seconds(temple_response)
+        if wait_time is not None:
+            backoff = _POLL_BACKOFF_INITIAL
+            continue
 
-        if wait_time is None:
-            available = (
-                temple_response.get("js_WonderViewButton", {}).get("buttonState")
-                == "enabled"
-            )
-            if available:
-                return
-            wait_time = 60
+        available = (
+            temple_response.get("js_WonderViewButton", {}).get("buttonState")
+            == "enabled"
+        )
+        if available:
+            return
 
         logger.debug(
-            "Waiting %d seconds to activate miracle %s",
-            wait_time + 5, island["wonderName"],
+            "No countdown for miracle %s, re-checking in %d seconds",
+            island["wonderName"], backoff + 5,
         )
-        sleep_with_heartbeat(session, wait_time + 5)
+        sleep_with_heartbeat(session, backoff + 5)
+        backoff = min(backoff * _POLL_BACKOFF_MULT, _POLL_BACKOFF_MAX)
 
 
 def _is_error_response(response):
@@ -294,8 +353,10 @@ def do_it(session, island, iterations):
     count = 0
     session.setStatus("[WAITING] Waiting to activate {}...".format(island["wonderName"]))
 
+    # Cooldown reported by the previous activation, if any
+    wait_time = None
     while infinite or count < iterations:
-        wait_for_miracle(session, island)
+        wait_for_miracle(session, island, wait_time)
 
         session.setStatus("[PROCESSING] Activating {}...".format(island["wonderName"]))
         response = activateMiracleHttpCall(session, island)
@@ -308,6 +369,11 @@ def do_it(session, island, iterations):
             report_critical_error(session, MODULE_NAME, msg)
             return
 
+        try:
+            wait_time = _cooldown_seconds(response[2][1])
+        except (IndexError, KeyError, TypeError, AttributeError):
+            wait_time = None
+
         count += 1
         if not infinite:
             iterations_left = iterations - count
@@ -373,16 +439,9 @@ def activateMiracle(session, event, stdin_fd):
 
             # Extract cooldown from response
             try:
-                data = result[2][1]
-            except (IndexError, KeyError, TypeError):
-                data = {}
-            wait_time = 0
-            for elem in data:
-                if isinstance(data[elem], dict) and "countdown" in data[elem]:
-                    enddate = data[elem]["countdown"]["enddate"]
-                    currentdate = data[elem]["countdown"]["currentdate"]
-                    wait_time = int(float(enddate)) - int(float(currentdate))
-                    break
+                wait_time = _cooldown_seconds(result[2][1]) or 0
+            except (IndexError, KeyError, TypeError, AttributeError):
+                wait_time = 0
 
             print("The miracle {} was activated.".format(island["wonderName"]))
             enter()
@@ -8,14 +8,17 @@ Includes heartbeat-based frozen process detection: if a module's
 potentially frozen and a new instance is launched.
 """
 
+import copy
 import datetime
-import json
+import functools
 import os
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from autoIkabot import config
 from autoIkabot.ui.prompts import banner, enter, read, read_input
+from autoIkabot.utils import fastjson
 from autoIkabot.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -33,27 +36,54 @@ RESTORE_HEALTH_STATES = {"WAITING", "PROCESSING", "PAUSED"}
 # Config file helpers
 # ---------------------------------------------------------------------------
 
-def _get_autoload_file_path(session) -> str:
-    """Return path to the autoload config file for this account."""
-    safe_server = session.servidor.replace("/", "_").replace("\\", "_")
-    safe_user = session.username.replace("/", "_").replace("\\", "_")
+@functools.lru_cache(maxsize=16)
+def _autoload_file_path(servidor: str, username: str) -> str:
+    """Build the autoload config path for one account (memoized)."""
+    safe_server = servidor.replace("/", "_").replace("\\", "_")
+    safe_user = username.replace("/", "_").replace("\\", "_")
     filename = ".autoikabot_autoload_{}_{}.json".format(safe_server, safe_user)
     return os.path.join(os.path.expanduser("~"), filename)
 
 
+def _get_autoload_file_path(session) -> str:
+    """Return path to the autoload config file for this account."""
+    return _autoload_file_path(session.servidor, session.username)
+
+
+# filepath -> (stat key, parsed configs) as last read or written, so the
+# settings menu doesn't re-read and re-parse an unchanged file per redraw
+_config_cache: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+
+
+def _stat_key(st: os.stat_result) -> tuple:
+    """Return the cache key for a config file with stat result ``st``."""
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 def _load_autoload_configs(session) -> Dict[str, Any]:
-    """Load the autoload config file, returning a default if missing."""
+    """Load the autoload config file, returning a default if missing.
+
+    The parsed file is cached until its inode, mtime or size changes;
+    callers always get their own deep copy and may mutate it freely.
+    """
     filepath = _get_autoload_file_path(session)
-    if not os.path.exists(filepath):
+    try:
+        key = _stat_key(os.stat(filepath))
+    except OSError:
         return {"version": 1, "configs": []}
+    cached = _config_cache.get(filepath)
+    if cached is not None and cached[0] == key:
+        return copy.deepcopy(cached[1])
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        # Parse the raw bytes; fastjson needs no text decode first
+        with open(filepath, "rb") as f:
+            data = fastjson.loads(f.read())
         if not isinstance(data, dict) or "configs" not in data:
             return {"version": 1, "configs": []}
-        return data
-    except (json.JSONDecodeError, IOError):
+    except (ValueError, OSError):
         return {"version": 1, "configs": []}
+    _config_cache[filepath] = (key, copy.deepcopy(data))
+    return data
 
 
 def _save_autoload_configs(session, config_data: Dict[str, Any]) -> None:
@@ -61,10 +91,13 @@ def _save_autoload_configs(session, config_data: Dict[str, Any]) -> None:
     filepath = _get_autoload_file_path(session)
     tmp_path = filepath + ".tmp"
     try:
-        with open(tmp_path, "w") as f:
-            json.dump(config_data, f, indent=2)
+        with open(tmp_path, "wb") as f:
+            f.write(fastjson.dumps(config_data, indent=True))
         os.replace(tmp_path, filepath)
-    except IOError as e:
+        _config_cache[filepath] = (
+            _stat_key(os.stat(filepath)), copy.deepcopy(config_data)
+        )
+    except OSError as e:
         logger.warning("Could not save autoload configs: %s", e)
 
 
@@ -137,28 +170,32 @@ def launch_saved_configs(session) -> None:
         The game session.
     """
     config_data = _load_autoload_configs(session)
-    configs = config_data.get("configs", [])
-    if not configs:
+    # Nothing enabled means nothing to launch: skip the process-list sweep
+    enabled_configs = [
+        cfg for cfg in config_data.get("configs", []) if cfg.get("enabled", False)
+    ]
+    if not enabled_configs:
         return
 
     from autoIkabot.ui.menu import dispatch_module_auto, get_registered_modules
     from autoIkabot.utils.process import is_process_frozen, update_process_list
 
-    modules = get_registered_modules()
+    # Menu numbers are unique, so each config resolves with one dict hit
+    modules_by_number = {m["number"]: m for m in get_registered_modules()}
     process_list = update_process_list(session)
 
-    # Build set of healthy running module names
-    running_healthy = {
-        p["action"]
-        for p in process_list
-        if not is_process_frozen(p)
-    }
+    # Split processes by module once, checking each heartbeat only once:
+    # healthy running module names, and frozen processes per module
+    running_healthy = set()
+    frozen_by_action: Dict[str, List[Dict[str, Any]]] = {}
+    for p in process_list:
+        if is_process_frozen(p):
+            frozen_by_action.setdefault(p["action"], []).append(p)
+        else:
+            running_healthy.add(p["action"])
 
     launched = 0
-    for cfg in configs:
-        if not cfg.get("enabled", False):
-            continue
-
+    for cfg in enabled_configs:
         module_name = cfg["module_name"]
 
         if cfg.get("last_shutdown_restore") is False:
@@ -172,10 +209,7 @@ def launch_saved_configs(session) -> None:
             continue
 
         # Warn about frozen instances
-        frozen = [
-            p for p in process_list
-            if p["action"] == module_name and is_process_frozen(p)
-        ]
+        frozen = frozen_by_action.get(module_name)
         if frozen:
             pids = [p["pid"] for p in frozen]
             print(
@@ -185,9 +219,7 @@ def launch_saved_configs(session) -> None:
             )
 
         # Find the module in the registry
-        mod = next(
-            (m for m in modules if m["number"] == cfg["module_number"]), None
-        )
+        mod = modules_by_number.get(cfg["module_number"])
         if mod is None:
             logger.warning(
                 "AutoLoad: module number %d (%s) not found in registry",
@@ -405,17 +437,15 @@ def _read_recorded_inputs_from_child() -> Optional[List]:
     list or None
         The recorded inputs, or None if the file doesn't exist.
     """
-    filepath = os.path.join(
-        os.path.expanduser("~"), ".autoikabot_recorded_inputs.json"
-    )
+    filepath = config.RECORDED_INPUTS_FILE
     if not os.path.exists(filepath):
         return None
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        with open(filepath, "rb") as f:
+            data = fastjson.loads(f.read())
         os.remove(filepath)
         return data if isinstance(data, list) else None
-    except (json.JSONDecodeError, IOError):
+    except (ValueError, OSError):
         return None
 
 
@@ -14,7 +14,14 @@ import sys
 from collections import deque
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from autoIkabot.config import CITY_URL, IS_WINDOWS, MATERIALS_NAMES, VERSION
+from autoIkabot import config
+from autoIkabot.config import (
+    CITY_URL,
+    IS_WINDOWS,
+    MATERIALS_NAMES,
+    VERSION,
+)
+from autoIkabot.utils import fastjson
 
 
 class ReturnToMainMenu(Exception):
@@ -297,17 +304,12 @@ def flush_recorded_inputs_to_file() -> None:
     Called by child processes before ``event.set()`` so the parent can
     read the recorded inputs after the config phase completes.
     """
-    import json as _json
-
     if not _recorded_inputs:
         return
-    filepath = os.path.join(
-        os.path.expanduser("~"), ".autoikabot_recorded_inputs.json"
-    )
     try:
-        with open(filepath, "w") as f:
-            _json.dump(list(_recorded_inputs), f)
-    except IOError:
+        with open(config.RECORDED_INPUTS_FILE, "wb") as f:
+            f.write(fastjson.dumps(list(_recorded_inputs)))
+    except OSError:
         pass
 
 
@@ -0,0 +1,73 @@
+"""JSON parsing/serialization with optional orjson acceleration.
+
+orjson (optional ``fast`` extra) parses several times faster than the
+stdlib and reads ``bytes`` directly, so response bodies need no ``.text``
+decode first.  It is strict about unescaped control characters, which the
+game and lobby occasionally emit, so anything it rejects is retried with
+the stdlib parser in non-strict mode.
+
+Usage:
+    from autoIkabot.utils import fastjson
+
+    data = fastjson.loads(response.content)
+    blob = fastjson.dumps(accounts, indent=True)
+"""
+
+import json
+from typing import Any, Union
+
+try:  # optional ``fast`` extra
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when it is installed.
+
+    Parameters
+    ----------
+    data : str or bytes
+        The JSON text or raw (UTF-8/16/32) bytes.
+
+    Returns
+    -------
+    Any
+        The decoded JSON value.
+
+    Raises
+    ------
+    ValueError
+        If the document is not valid JSON (``json.JSONDecodeError``).
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data, strict=False)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, using orjson when installed.
+
+    Parameters
+    ----------
+    obj : Any
+        The value to serialize.
+    indent : bool
+        Pretty-print with a two-space indent.
+
+    Returns
+    -------
+    bytes
+        UTF-8 encoded JSON (non-ASCII characters are not escaped).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except orjson.JSONEncodeError:
+            pass  # e.g. non-str dict keys or ints beyond 64 bits
+    return json.dumps(
+        obj, indent=2 if indent else None, ensure_ascii=False
+    ).encode("utf-8")
@@ -26,6 +26,8 @@ from collections import deque
 from typing import Any, Dict, List, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from autoIkabot.config import (
     ACTION_REQUEST_PLACEHOLDER,
@@ -40,6 +42,26 @@ from autoIkabot.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+def _new_http_session() -> requests.Session:
+    """Create a requests.Session for game traffic in a child process.
+
+    Mirrors the adapter core.login mounts: connections to the game host
+    are kept alive in a small pool (the module thread and the health check
+    share it), and failed connects are retried inside urllib3 before the
+    slower CONNECTION_ERROR_WAIT loop in get()/post() kicks in.  Reads are
+    never retried, since a POST may already have reached the server.
+    """
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
 class SessionBrokenError(RuntimeError):
     """Raised when session communications are unrecoverably broken."""
 
@@ -131,6 +153,10 @@ class Session:
         # Proxy state lock (health check thread reads _proxy_active)
         self._proxy_lock = threading.Lock()
 
+        # Serializes expiry recovery when threads share this session
+        self._relogin_lock = threading.Lock()
+        self._last_relogin_at: float = 0.0
+
         logger.info(
             "Session initialized: %s on s%s-%s (%s)",
             self.username, self.mundo, self.servidor, self.world_name,
@@ -211,7 +237,7 @@ class Session:
         obj._network_retry_budget = int(data.get("network_retry_budget", 3))
 
         # Build fresh requests.Session
-        obj.s = requests.Session()
+        obj.s = _new_http_session()
         obj.s.headers.update(data["game_headers"])
         ikariam_cookie = data.get("ikariam_cookie")
         if ikariam_cookie:
@@ -226,6 +252,8 @@ class Session:
         obj._rate_lock = threading.Lock()
         obj._city_lock = threading.Lock()
         obj._proxy_lock = threading.Lock()
+        obj._relogin_lock = threading.Lock()
+        obj._last_relogin_at = 0.0
 
         # Child process defaults
         obj.is_parent = False
@@ -465,6 +493,24 @@ class Session:
             logger.error("Re-login failed: %s", e)
             raise
 
+    def _recover_expired_session(self, sent_at: float) -> None:
+        """Run _handle_session_expired() once for concurrent expiry reports.
+
+        Threads sharing the session (e.g. parallel page fetches) can all
+        see the expired page.  The first one refreshes the session; any
+        request sent before that refresh finished just retries with it.
+
+        Parameters
+        ----------
+        sent_at : float
+            ``time.monotonic()`` taken before the expired request was sent.
+        """
+        with self._relogin_lock:
+            if self._last_relogin_at > sent_at:
+                return
+            self._handle_session_expired()
+            self._last_relogin_at = time.monotonic()
+
     # ------------------------------------------------------------------
     # Proxy management
     # ------------------------------------------------------------------
@@ -722,15 +768,18 @@ class Session:
             try:
                 self._enforce_rate_limit()
 
-                # Track request
-                self.request_history.append({
+                # Track request; keep our own entry, other threads may
+                # append to the shared history meanwhile
+                entry = {
                     "method": "GET",
                     "url": full_url,
                     "params": params,
                     "payload": None,
                     "response": None,
-                })
+                }
+                self.request_history.append(entry)
                 logger.debug("GET %s params=%s", full_url, params)
+                sent_at = time.monotonic()
 
                 response = self.s.get(
                     full_url,
@@ -740,7 +789,7 @@ class Session:
                     **kwargs,
                 )
 
-                self.request_history[-1]["response"] = {
+                entry["response"] = {
                     "status": response.status_code,
                     "elapsed": response.elapsed.total_seconds(),
                 }
@@ -759,7 +808,7 @@ class Session:
 
                 # Check for session expiry
                 if not ignore_expire and self._is_expired(html):
-                    self._handle_session_expired()
+                    self._recover_expired_session(sent_at)
                     continue  # retry after re-login
 
                 return response if full_response else html
@@ -859,14 +908,16 @@ class Session:
             try:
                 self._enforce_rate_limit()
 
-                self.request_history.append({
+                entry = {
                     "method": "POST",
                     "url": full_url,
                     "params": params,
                     "payload": payload,
                     "response": None,
-                })
+                }
+                self.request_history.append(entry)
                 logger.debug("POST %s payload=%s", full_url, payload)
+                sent_at = time.monotonic()
 
                 response = self.s.post(
                     full_url,
@@ -878,7 +929,7 @@ class Session:
                     **kwargs,
                 )
 
-                self.request_history[-1]["response"] = {
+                entry["response"] = {
                     "status": response.status_code,
                     "elapsed": response.elapsed.total_seconds(),
                 }
@@ -897,7 +948,7 @@ class Session:
 
                 # Check for session expiry
                 if not ignore_expire and self._is_expired(resp_text):
-                    self._handle_session_expired()
+                    self._recover_expired_session(sent_at)
                     # Rebuild request with fresh token and retry via loop
                     url = url_original
                     payload = dict(payload_original)
@@ -1012,11 +1063,12 @@ class Session:
         while not self._health_stop.wait(timeout=interval):
             try:
                 logger.debug("Health check: pinging game server")
+                sent_at = time.monotonic()
                 html = self.get(HEALTH_CHECK_VIEW, ignore_expire=True)
 
                 if self._is_expired(html):
                     logger.warning("Health check detected expired session")
-                    self._handle_session_expired()
+                    self._recover_expired_session(sent_at)
                     logger.info("Health check: re-login successful")
                 elif self._is_maintenance(html):
                     logger.info("Health check: server in maintenance mode")
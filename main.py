@@ -9,7 +9,6 @@ Background modules are spawned as child processes and are always terminated
 when the parent exits (menu exit, Ctrl+C, or unhandled error path).
 """
 
-import multiprocessing
 import os
 import sys
 
@@ -376,6 +375,9 @@ def _update_cached_tokens(account_info, login_result, logger):
 
 
 if __name__ == "__main__":
-    # Required for multiprocessing on Windows
-    multiprocessing.freeze_support()
+    # Required for multiprocessing in frozen Windows executables only
+    # (same guard as autoIkabot/__main__.py)
+    if sys.platform == "win32" and getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
@@ -1,6 +1,42 @@
 import os
 import sys
 
+import pytest
+
 ROOT = os.path.dirname(os.path.dirname(__file__))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+
+class FakeSession:
+    """Stand-in for the game ``Session`` used by helper and module tests.
+
+    ``on_get`` receives the requested URL and ``on_post`` receives the
+    ``params`` dict (or the URL when no params are given).  GETs echo the URL
+    and POSTs return ``""`` by default.  Every call is recorded in
+    ``gets``/``posts``.
+    """
+
+    def __init__(self):
+        self.on_get = lambda url: url
+        self.on_post = lambda request: ""
+        self.gets = []
+        self.posts = []
+        self.statuses = []
+
+    def get(self, url="", params=None, **kwargs):
+        self.gets.append(url)
+        return self.on_get(url)
+
+    def post(self, url="", payload=None, params=None, **kwargs):
+        request = params if params is not None else url
+        self.posts.append(request)
+        return self.on_post(request)
+
+    def setStatus(self, status):
+        self.statuses.append(status)
+
+
+@pytest.fixture
+def fake_session():
+    return FakeSession()
@@ -0,0 +1,67 @@
+import hashlib
+import os
+import stat
+
+import pytest
+from cryptography.exceptions import InvalidTag
+
+from autoIkabot.data import account_store
+
+
+def test_save_accounts_writes_owner_only_file_and_round_trips(tmp_path, monkeypatch):
+    accounts_file = tmp_path / "accounts.enc"
+    monkeypatch.setattr(account_store, "ACCOUNTS_FILE", accounts_file)
+
+    accounts = account_store.add_account([], "user@example.com", "pw", servers=["s1-en"])
+    account_store.save_accounts(accounts, "master")
+
+    assert not accounts_file.with_suffix(".tmp").exists()
+    if os.name != "nt":
+        assert stat.S_IMODE(accounts_file.stat().st_mode) == 0o600
+    assert account_store.load_accounts("master") == accounts
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes")
+def test_save_accounts_replaces_stale_world_readable_tmp_file(tmp_path, monkeypatch):
+    accounts_file = tmp_path / "accounts.enc"
+    monkeypatch.setattr(account_store, "ACCOUNTS_FILE", accounts_file)
+    stale = accounts_file.with_suffix(".tmp")
+    stale.write_bytes(b"left over from an interrupted save")
+    stale.chmod(0o644)
+
+    account_store.save_accounts([{"email": "a@example.com"}], "master")
+
+    assert not stale.exists()
+    assert stat.S_IMODE(accounts_file.stat().st_mode) == 0o600
+    assert account_store.load_accounts("master") == [{"email": "a@example.com"}]
+
+
+def test_load_accounts_reuses_decrypted_copy_until_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(account_store, "ACCOUNTS_FILE", tmp_path / "accounts.enc")
+    monkeypatch.setattr(account_store, "_accounts_cache", None)
+    account_store.save_accounts([{"email": "a@example.com"}], "master")
+
+    calls = []
+    real_decrypt = account_store.decrypt
+    monkeypatch.setattr(
+        account_store, "decrypt", lambda *a: calls.append(1) or real_decrypt(*a)
+    )
+
+    first = account_store.load_accounts("master")
+    first[0]["email"] = "mutated"
+    assert account_store.load_accounts("master") == [{"email": "a@example.com"}]
+    assert calls == []  # served from the cache primed by save_accounts
+    # The cache never holds a plain (offline-crackable) password hash
+    assert hashlib.sha256(b"master").digest() not in account_store._accounts_cache[0]
+
+    with pytest.raises(InvalidTag):
+        account_store.load_accounts("wrong password")
+    assert calls == [1]
+
+
+def test_accounts_file_exists_is_false_when_parent_is_a_file(tmp_path, monkeypatch):
+    parent = tmp_path / "data"
+    parent.write_text("not a directory")
+    monkeypatch.setattr(account_store, "ACCOUNTS_FILE", parent / "accounts.enc")
+
+    assert account_store.accounts_file_exists() is False
@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+import types
+
+import pytest
+
+import autoIkabot.modules.activateMiracle as am_mod
+
+_ISLANDS = {
+    "1": {"id": "1", "x": 10, "y": 20, "wonder": "3", "wonderName": "Hephaistos"},
+    "2": {"id": "2", "x": 30, "y": 40, "wonder": "5", "wonderName": "Athena"},
+}
+_TEMPLE = [
+    None,
+    [None, [None, '<div id="wonderLevelDisplay" class="x">\n   7  </div>']],
+    [None, {"js_WonderViewButton": {"buttonState": "enabled"}}],
+]
+
+
+@pytest.fixture
+def miracle_session(monkeypatch, fake_session):
+    """Two islands with one city each; city 10 has a temple on an enabled wonder."""
+    cities = {
+        "10": {"id": "10", "coords": "[10:20] ", "islandId": "1", "position": [{"building": "temple"}]},
+        "20": {"id": "20", "coords": "[30:40] ", "islandId": "2", "position": [{"building": "port"}]},
+    }
+    fake_session.on_post = lambda params: json.dumps(_TEMPLE)
+
+    monkeypatch.setattr(am_mod, "getIslandsIds", lambda _s: ["1", "2"])
+    monkeypatch.setattr(am_mod, "getIdsOfCities", lambda _s: (list(cities), cities))
+    monkeypatch.setattr(am_mod, "getIsland", lambda html: dict(_ISLANDS[html.rsplit("=", 1)[1]]))
+    monkeypatch.setattr(am_mod, "getCity", lambda html: dict(cities[html.rsplit("=", 1)[1]]))
+    return fake_session
+
+
+def _frozen_clock(monkeypatch):
+    monkeypatch.setattr(am_mod, "time", types.SimpleNamespace(monotonic=lambda: 1000.0, time=time.time))
+
+
+def test_wait_for_miracle_backs_off_without_countdown_and_resets(monkeypatch, fake_session):
+    disabled = [None, None, [None, {"js_WonderViewButton": {"buttonState": "disabled"}}]]
+    countdown = [None, None, [None, {"x": {"countdown": {"enddate": "200", "currentdate": "100"}}}]]
+    enabled = [None, None, [None, {"js_WonderViewButton": {"buttonState": "enabled"}}]]
+    responses = iter([disabled] * 6 + [countdown, disabled, enabled])
+    sleeps = []
+    fake_session.on_post = lambda params: json.dumps(next(responses))
+
+    monkeypatch.setattr(am_mod, "getDateTime", lambda *_args, **_kwargs: "DATE")
+    monkeypatch.setattr(am_mod, "sleep_with_heartbeat", lambda _s, t: sleeps.append(t))
+    _frozen_clock(monkeypatch)
+
+    am_mod.wait_for_miracle(fake_session, {"wonderName": "Athena", "ciudad": {"id": 1, "pos": 0}})
+
+    assert sleeps == [35, 65, 125, 245, 485, 905, 105, 35]
+
+
+def test_do_it_sleeps_through_known_cooldown_before_polling(monkeypatch, fake_session):
+    events = []
+    enabled = [None, None, [None, {"js_WonderViewButton": {"buttonState": "enabled"}}]]
+    activated = [None, [None, ["ok"]], [None, {"x": {"countdown": {"enddate": "400", "currentdate": "100"}}}]]
+    fake_session.on_post = lambda params: events.append(("post", params["view"])) or json.dumps(enabled)
+
+    monkeypatch.setattr(am_mod, "activateMiracleHttpCall", lambda *_args: activated)
+    monkeypatch.setattr(am_mod, "getDateTime", lambda *_args, **_kwargs: "DATE")
+    monkeypatch.setattr(am_mod, "sleep_with_heartbeat", lambda _s, t: events.append(("sleep", t)))
+    _frozen_clock(monkeypatch)
+
+    am_mod.do_it(fake_session, {"wonderName": "Athena", "ciudad": {"id": 1, "pos": 0}}, iterations=2)
+
+    # First wait polls once; the second sleeps out the reported 300s first
+    assert events == [("post", "temple"), ("sleep", 305), ("post", "temple")]
+
+
+def test_obtain_miracles_fetches_islands_concurrently(miracle_session):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def on_get(url):
+        if url.startswith("view=island"):
+            barrier.wait()  # both island views must be in flight together
+        return url
+
+    miracle_session.on_get = on_get
+    result = am_mod.obtainMiraclesAvailable(miracle_session)
+
+    assert [island["id"] for island in result] == ["1"]
+    assert result[0]["available"] is True
+    assert result[0]["ciudad"]["pos"] == "0"
+    assert [params["cityId"] for params in miracle_session.posts] == ["10"]
+
+
+def test_obtain_miracles_skips_wonder_already_covered(miracle_session):
+    # A second city on island 1 shares its wonder, so no second temple query
+    cities = am_mod.getIdsOfCities(miracle_session)[1]
+    cities["11"] = dict(cities["10"], id="11")
+    cities["30"] = {"id": "30", "coords": "[99:99] ", "islandId": "9", "position": []}
+
+    result = am_mod.obtainMiraclesAvailable(miracle_session)
+
+    assert [island["id"] for island in result] == ["1"]
+    assert [params["cityId"] for params in miracle_session.posts] == ["10"]
+
+
+@pytest.mark.parametrize(
+    "fragment, level",
+    [
+        ('<div id="wonderLevelDisplay" class="x">\n   7  </div>', 7),
+        ('<div id="wonderLevelDisplay">\\n 12 </div>', 12),
+        ('<div id="wonderLevelDisplay">3</div>', 3),
+        ("<div></div>", None),
+    ],
+)
+def test_wonder_level_regex(fragment, level):
+    match = am_mod._RE_WONDER_LEVEL.search(fragment)
+    assert (int(match.group(1)) if match else None) == level
+
+
+def test_obtain_miracles_reads_wonder_level(miracle_session):
+    assert am_mod.obtainMiraclesAvailable(miracle_session)[0]["wonderActivationLevel"] == 7
@@ -0,0 +1,120 @@
+import os
+import types
+
+from autoIkabot.modules import autoLoader
+from autoIkabot.ui import menu
+from autoIkabot.utils import fastjson, process
+
+
+def test_load_autoload_configs_parses_raw_file_bytes(tmp_path, monkeypatch):
+    path = tmp_path / "autoload.json"
+    monkeypatch.setattr(autoLoader, "_get_autoload_file_path", lambda _s: str(path))
+
+    assert autoLoader._load_autoload_configs(None) == {"version": 1, "configs": []}
+
+    path.write_bytes('{"version": 1, "configs": [{"description": "Héphaïstos"}]}'.encode("utf-8"))
+    assert autoLoader._load_autoload_configs(None)["configs"][0]["description"] == "Héphaïstos"
+
+    path.write_bytes(b"\xff{not json")
+    assert autoLoader._load_autoload_configs(None) == {"version": 1, "configs": []}
+
+
+def test_save_autoload_configs_round_trips_indented_utf8(tmp_path, monkeypatch):
+    path = tmp_path / "autoload.json"
+    monkeypatch.setattr(autoLoader, "_get_autoload_file_path", lambda _s: str(path))
+    data = {"version": 1, "configs": [{"description": "Héphaïstos", "inputs": [1, "y"]}]}
+
+    autoLoader._save_autoload_configs(None, data)
+
+    raw = path.read_bytes()
+    assert b'\n  "configs"' in raw
+    assert "Héphaïstos".encode("utf-8") in raw
+    assert not (tmp_path / "autoload.json.tmp").exists()
+    assert autoLoader._load_autoload_configs(None) == data
+
+
+def test_launch_saved_configs_checks_each_process_heartbeat_once(monkeypatch):
+    cfg_data = {
+        "configs": [
+            {"enabled": True, "module_name": name, "module_number": i, "description": "", "inputs": []}
+            for i, name in enumerate(["A", "B", "C"], 1)
+        ]
+    }
+    plist = [
+        {"action": "A", "pid": 1},
+        {"action": "B", "pid": 2},
+        {"action": "B", "pid": 3},
+    ]
+    checked = []
+
+    def is_frozen(p):
+        checked.append(p["pid"])
+        return p["action"] == "B"
+
+    monkeypatch.setattr(autoLoader, "_load_autoload_configs", lambda session: cfg_data)
+    monkeypatch.setattr(autoLoader, "_save_autoload_configs", lambda session, data: None)
+    monkeypatch.setattr(menu, "get_registered_modules", lambda: [
+        {"name": name, "number": i, "background": True} for i, name in enumerate(["A", "B", "C"], 1)
+    ])
+    monkeypatch.setattr(process, "update_process_list", lambda session: plist)
+    monkeypatch.setattr(process, "is_process_frozen", is_frozen)
+    launched = []
+    monkeypatch.setattr(menu, "dispatch_module_auto", lambda session, mod, inputs: launched.append(mod["name"]) or True)
+
+    autoLoader.launch_saved_configs(session=object())
+
+    assert sorted(checked) == [1, 2, 3]
+    assert launched == ["B", "C"]
+
+
+def test_autoload_file_path_is_sanitized_and_memoized():
+    autoLoader._autoload_file_path.cache_clear()
+    session = types.SimpleNamespace(servidor="en/x", username="a\\b")
+
+    first = autoLoader._get_autoload_file_path(session)
+    second = autoLoader._get_autoload_file_path(session)
+
+    assert first == second
+    assert os.path.basename(first) == ".autoikabot_autoload_en_x_a_b.json"
+    assert autoLoader._autoload_file_path.cache_info().hits == 1
+    autoLoader._autoload_file_path.cache_clear()
+
+
+def test_load_autoload_configs_caches_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "autoload.json"
+    monkeypatch.setattr(autoLoader, "_get_autoload_file_path", lambda _s: str(path))
+    monkeypatch.setattr(autoLoader, "_config_cache", {})
+    parses = []
+    monkeypatch.setattr(autoLoader, "fastjson", types.SimpleNamespace(
+        loads=lambda b: parses.append(1) or fastjson.loads(b),
+        dumps=fastjson.dumps,
+    ))
+
+    path.write_bytes(b'{"version": 1, "configs": [{"module_name": "A"}]}')
+    first = autoLoader._load_autoload_configs(None)
+    first["configs"].append("mutated")
+    second = autoLoader._load_autoload_configs(None)
+
+    assert second == {"version": 1, "configs": [{"module_name": "A"}]}
+    assert len(parses) == 1
+
+    # Saving refreshes the cache without a re-parse
+    autoLoader._save_autoload_configs(None, {"version": 1, "configs": []})
+    assert autoLoader._load_autoload_configs(None) == {"version": 1, "configs": []}
+    assert len(parses) == 1
+
+    # An outside edit changes the stat key and is picked up
+    path.write_bytes(b'{"version": 1, "configs": [{"module_name": "BB"}]}')
+    assert autoLoader._load_autoload_configs(None)["configs"] == [{"module_name": "BB"}]
+    assert len(parses) == 2
+
+
+def test_launch_saved_configs_skips_process_scan_when_nothing_enabled(monkeypatch):
+    cfg_data = {"configs": [{"enabled": False, "module_name": "A", "module_number": 1, "inputs": []}]}
+    monkeypatch.setattr(autoLoader, "_load_autoload_configs", lambda session: cfg_data)
+    monkeypatch.setattr(
+        process, "update_process_list",
+        lambda session: (_ for _ in ()).throw(AssertionError("process list should not be read")),
+    )
+
+    autoLoader.launch_saved_configs(session=object())
@@ -0,0 +1,40 @@
+import pytest
+import requests
+
+from autoIkabot.core import captcha_handler
+from autoIkabot.core import dns_resolver
+
+
+def test_captcha_api_skipped_during_failure_cooldown(monkeypatch, fake_session):
+    def failing_post(url):
+        raise requests.exceptions.ConnectionError("down")
+
+    fake_session.on_post = failing_post
+    monkeypatch.setattr(captcha_handler, "_api_failure_until", 0.0)
+    monkeypatch.setattr(dns_resolver, "get_api_address", lambda: "http://api")
+    monkeypatch.setattr(captcha_handler, "_get_session", lambda: fake_session)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        captcha_handler._solve_via_api(b"t", b"i")
+    with pytest.raises(RuntimeError, match="failed recently"):
+        captcha_handler._solve_via_api(b"t", b"i")
+
+    assert len(fake_session.posts) == 1
+
+
+@pytest.mark.parametrize("status, body", [(200, b"2"), (200, b"7"), (200, b"x"), (403, b"1")])
+def test_captcha_api_response_validation(monkeypatch, fake_session, status, body):
+    class FakeResponse:
+        status_code = status
+        content = body
+
+    fake_session.on_post = lambda url: FakeResponse()
+    monkeypatch.setattr(captcha_handler, "_api_failure_until", 0.0)
+    monkeypatch.setattr(dns_resolver, "get_api_address", lambda: "http://api")
+    monkeypatch.setattr(captcha_handler, "_get_session", lambda: fake_session)
+
+    if status == 200 and body == b"2":
+        assert captcha_handler._solve_via_api(b"t", b"i") == 2
+    else:
+        with pytest.raises(RuntimeError, match="bad response"):
+            captcha_handler._solve_via_api(b"t", b"i")
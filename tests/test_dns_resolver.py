@@ -0,0 +1,131 @@
+import json
+import os
+import socket
+import threading
+
+from autoIkabot.core import dns_resolver
+
+
+def test_dns_build_query_encodes_txt_question():
+    query = dns_resolver._build_dns_query("example.com")
+
+    assert query[:12] == b"\x12\x34\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00"
+    assert query[12:] == b"\x07example\x03com\x00\x00\x10\x00\x01"
+
+
+def test_get_api_address_resolves_and_persists(tmp_path, monkeypatch):
+    def fake_lookup(domain, dns_servers):
+        return "8.8.8.8", dns_resolver._txt_to_address("1.2.3.4:5000/ikagod/ikabot")
+
+    monkeypatch.delenv(dns_resolver.CUSTOM_API_ADDRESS_ENV, raising=False)
+    # setenv first so monkeypatch restores the variable the resolver exports
+    monkeypatch.setenv(dns_resolver.RESOLVED_API_ADDRESS_ENV, "")
+    monkeypatch.delenv(dns_resolver.RESOLVED_API_ADDRESS_ENV)
+    dns_resolver._resolve.cache_clear()
+    monkeypatch.setattr(dns_resolver, "_query_dns_servers", fake_lookup)
+    monkeypatch.setattr(dns_resolver, "API_ADDRESS_CACHE_FILE", tmp_path / "api_address.cache")
+
+    assert dns_resolver.get_api_address() == "http://1.2.3.4:5000"
+    dns_resolver._resolve.cache_clear()
+    assert json.loads((tmp_path / "api_address.cache").read_text())["address"] == "http://1.2.3.4:5000"
+    assert dns_resolver.CUSTOM_API_ADDRESS_ENV not in os.environ
+    assert dns_resolver._load_exported_address(dns_resolver.PUBLIC_API_DOMAIN)[0] == "http://1.2.3.4:5000"
+    assert dns_resolver._load_exported_address("other.example.com") is None
+
+
+def test_resolve_uses_fresh_exported_address_per_domain(tmp_path, monkeypatch):
+    lookups = []
+
+    def fake_lookup(domain, dns_servers):
+        lookups.append(domain)
+        return "8.8.8.8", "http://9.9.9.9:5000"
+
+    monkeypatch.delenv(dns_resolver.CUSTOM_API_ADDRESS_ENV, raising=False)
+    monkeypatch.setenv(dns_resolver.RESOLVED_API_ADDRESS_ENV, json.dumps({
+        "fresh.example.com": ["http://1.1.1.1:5000", dns_resolver.time.time()],
+        "expired.example.com": ["http://2.2.2.2:5000", 0],
+    }))
+    dns_resolver._resolve.cache_clear()
+    monkeypatch.setattr(dns_resolver, "_query_dns_servers", fake_lookup)
+    monkeypatch.setattr(dns_resolver, "API_ADDRESS_CACHE_FILE", tmp_path / "api_address.cache")
+
+    assert dns_resolver.get_api_address("fresh.example.com") == "http://1.1.1.1:5000"
+    assert dns_resolver.get_api_address("expired.example.com") == "http://9.9.9.9:5000"
+    assert dns_resolver.get_api_address("other.example.com") == "http://9.9.9.9:5000"
+    assert lookups == ["expired.example.com", "other.example.com"]
+    dns_resolver._resolve.cache_clear()
+
+
+def test_get_api_address_falls_back_to_stale_disk_cache(tmp_path, monkeypatch):
+    cache_file = tmp_path / "api_address.cache"
+    cache_file.write_text(json.dumps({
+        "domain": dns_resolver.PUBLIC_API_DOMAIN,
+        "address": "http://5.6.7.8:5000",
+        "ts": 0,
+    }))
+
+    def failing_lookup(domain, dns_servers):
+        raise OSError("timed out")
+
+    monkeypatch.delenv(dns_resolver.CUSTOM_API_ADDRESS_ENV, raising=False)
+    monkeypatch.delenv(dns_resolver.RESOLVED_API_ADDRESS_ENV, raising=False)
+    dns_resolver._resolve.cache_clear()
+    monkeypatch.setattr(dns_resolver, "_query_dns_servers", failing_lookup)
+    monkeypatch.setattr(dns_resolver, "API_ADDRESS_CACHE_FILE", cache_file)
+
+    assert dns_resolver.get_api_address() == "http://5.6.7.8:5000"
+    dns_resolver._resolve.cache_clear()
+
+
+def test_dns_parse_txt_response_reads_compressed_and_plain_answers():
+    query = dns_resolver._build_dns_query("example.com")
+    header = b"\x12\x34\x81\x80\x00\x01\x00\x02\x00\x00\x00\x00"
+    question = query[12:]
+    # A record with a compressed name, then a TXT record with a plain name
+    a_record = b"\xc0\x0c\x00\x01\x00\x01\x00\x00\x00\x3c\x00\x04\x01\x02\x03\x04"
+    txt_rdata = b"\x07" + b"1.2.3.4" + b"\x05" + b":5000"
+    txt_record = (
+        b"\x07example\x03com\x00\x00\x10\x00\x01\x00\x00\x00\x3c"
+        + len(txt_rdata).to_bytes(2, "big") + txt_rdata
+    )
+
+    response = header + question + a_record + txt_record
+
+    assert dns_resolver._parse_txt_response(response) == "1.2.3.4:5000"
+
+
+def test_query_dns_servers_sends_to_ip_literals_before_resolving_names(monkeypatch):
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    received = threading.Event()
+
+    def answer():
+        query, client = server.recvfrom(512)
+        received.set()
+        txt = b"\x1a" + b"1.2.3.4:5000/ikagod/ikabot"
+        reply = (
+            query[:2] + b"\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00" + query[12:]
+            + b"\xc0\x0c\x00\x10\x00\x01\x00\x00\x00\x3c"
+            + len(txt).to_bytes(2, "big") + txt
+        )
+        server.sendto(reply, client)
+
+    lookups = []
+
+    def slow_lookup(name):
+        # The literal's query must already be out while the name resolves
+        lookups.append((name, received.wait(timeout=5)))
+        raise OSError("name resolution failed")
+
+    monkeypatch.setattr(dns_resolver, "_DNS_PORT", server.getsockname()[1])
+    monkeypatch.setattr(dns_resolver, "_resolve_server_name", slow_lookup)
+    thread = threading.Thread(target=answer, daemon=True)
+    thread.start()
+    try:
+        result = dns_resolver._query_dns_servers("example.com", ["ns.example.invalid", "127.0.0.1"])
+    finally:
+        thread.join(timeout=5)
+        server.close()
+
+    assert result == ("127.0.0.1", "http://1.2.3.4:5000")
+    assert lookups == [("ns.example.invalid", True)]
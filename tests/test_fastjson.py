@@ -0,0 +1,13 @@
+import pytest
+
+from autoIkabot.utils import fastjson
+
+
+def test_fastjson_loads_tolerates_control_characters(monkeypatch):
+    body = b'{"name": "tab\there", "n": [1, 2]}'
+    assert fastjson.loads(body) == {"name": "tab\there", "n": [1, 2]}
+
+    monkeypatch.setattr(fastjson, "orjson", None)
+    assert fastjson.loads(body) == {"name": "tab\there", "n": [1, 2]}
+    with pytest.raises(ValueError):
+        fastjson.loads(b"<html>")
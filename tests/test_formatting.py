@@ -0,0 +1,32 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from autoIkabot.helpers.formatting import addThousandSeparator, getDateTime
+
+
+@pytest.mark.parametrize(
+    "num,character,expected",
+    [
+        (3000, ".", "3.000"),
+        (1234567.9, ".", "1.234.567"),
+        (-45000, ",", "-45,000"),
+        (999, ".", "999"),
+        (1000000, " ", "1 000 000"),
+    ],
+)
+def test_add_thousand_separator(num, character, expected):
+    assert addThousandSeparator(num, character) == expected
+
+
+_NEGATIVE_OK = pytest.mark.skipif(os.name == "nt", reason="Windows rejects pre-epoch timestamps")
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [86400.0, 86400.9, 86400, pytest.param(-1.5, marks=_NEGATIVE_OK), pytest.param(-0.25, marks=_NEGATIVE_OK)],
+)
+def test_get_date_time_matches_fromtimestamp(timestamp):
+    expected = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d_%H-%M-%S")
+    assert getDateTime(timestamp) == expected
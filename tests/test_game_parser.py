@@ -0,0 +1,51 @@
+from autoIkabot.helpers import game_parser as gp
+
+_CITY_HTML = (
+    '[["updateBackgroundData", {"id": 42, "name": "Sparta", "ownerName": "Leonidas",'
+    ' "islandXCoord": "10", "islandYCoord": "20", "islandId": "7",'
+    ' "position": [{"building": "townHall", "level": "5"},'
+    ' {"building": "buildingGround land"}]}],["updateTemplateData", {}]]'
+    " currentResources: JSON.parse('{\\\"citizens\\\":1,\\\"resource\\\":100,\\\"2\\\":300,"
+    "\\\"1\\\":200,\\\"4\\\":500,\\\"3\\\":400}')"
+    " maxResources: JSON.parse('{\\\"resource\\\":2500,\\\"1\\\":2500}')"
+    ' <span id="js_GlobalMenu_citizens">1,234</span>'
+    " wineSpendings: 17"
+    " branchOfficeResources: JSON.parse('{\\\"resource\\\":\\\"1\\\",\\\"1\\\":\\\"2\\\","
+    "\\\"2\\\":\\\"3\\\",\\\"3\\\":\\\"4\\\",\\\"4\\\":\\\"5\\\"}')"
+)
+
+
+def test_get_city_fields_match_individual_helpers():
+    city = gp.getCity(_CITY_HTML)
+
+    assert city["availableResources"] == gp.get_available_resources(_CITY_HTML) == [100, 200, 300, 400, 500]
+    assert city["storageCapacity"] == gp.get_warehouse_capacity(_CITY_HTML) == 2500
+    assert city["freeCitizens"] == gp.get_free_citizens(_CITY_HTML) == 1234
+    assert city["wineConsumptionPerHour"] == gp.get_wine_consumption(_CITY_HTML) == 17
+    assert city["resourcesListedForSale"] == gp.get_resources_listed_for_sale(_CITY_HTML) == [1, 2, 3, 4, 5]
+    assert city["freeSpaceForResources"] == [2399, 2298, 2197, 2096, 1995]
+    assert city["id"] == "42"
+    assert city["position"][1]["name"] == "empty"
+
+
+def test_decode_unicode_escape():
+    assert gp.decode_unicode_escape("u041cu043eu0441u043au0432u0430") == "Москва"
+    assert gp.decode_unicode_escape("Athens") == "Athens"
+    assert gp.decode_unicode_escape("Sau00eft") == "Saït"
+
+
+def test_get_ids_of_cities_orders_by_position(fake_session):
+    html = (
+        "relatedCityData: JSON.parse('{"
+        '\\"city_11\\":{\\"name\\":\\"Beta\\",\\"tradegood\\":\\"2\\",\\"position\\":\\"1\\"},'
+        '\\"city_7\\":{\\"name\\":\\"u0391lpha\\",\\"tradegood\\":\\"1\\",\\"position\\":\\"0\\"},'
+        '\\"selectedCity\\":\\"city_7\\",\\"additionalInfo\\":{}}'
+        "')"
+    )
+    fake_session.on_get = lambda url: html
+
+    ids, cities = gp.getIdsOfCities(fake_session)
+
+    assert ids == ["7", "11"]
+    assert cities["7"]["name"] == "Αlpha"
+    assert cities["11"]["tradegood"] == 2
@@ -0,0 +1,148 @@
+import json
+import types
+
+import pytest
+
+from autoIkabot.helpers import game_state
+from autoIkabot.utils import fastjson
+
+
+def test_parse_global_data_coerces_header_numbers():
+    header = {
+        "gold": "12345.67",
+        "income": 300,
+        "upkeep": -120.5,
+        "scientistsUpkeep": "-30",
+        "currentResources": {
+            "resource": "100", "1": 200, "2": 300.9, "3": "400", "4": 500,
+            "citizens": "250.4", "population": 300,
+        },
+        "maxResources": {"resource": 8000, "1": "8000", "2": 8000, "3": 8000, "4": 8000},
+        "resourceProduction": "0.5",
+        "tradegoodProduction": 0.25,
+        "producedTradegood": "2",
+        "wineSpendings": 12,
+        "freeTransporters": "3",
+        "maxTransporters": 5,
+        "relatedCity": {"id": 77},
+    }
+    state = game_state.parse_global_data(json.dumps([["updateGlobalData", {"headerData": header}]]))
+
+    assert state.gold == 12345
+    assert state.gold_production == 300 - 120 - 30
+    assert state.resources == [100, 200, 300, 400, 500]
+    assert state.storage == [8000] * 5
+    assert state.resource_production == 1800.0
+    assert state.tradegood_production == 900.0
+    assert (state.citizens, state.population) == (250, 300)
+    assert (state.free_transporters, state.max_transporters) == (3, 5)
+    assert state.current_city_id == "77"
+
+
+def test_parse_resource_bar_reads_all_fields_in_one_pass():
+    html = (
+        '<li id="js_GlobalMenu_gold">1,234,567</li>'
+        '<span id="js_GlobalMenu_wood">2.500</span>'
+        '<span id="js_GlobalMenu_max_wood">10,000</span>'
+        '<span id="js_GlobalMenu_freeTransporters">7</span>'
+        '<span id="js_GlobalMenu_wood">9</span>'  # later duplicate is ignored
+    )
+    result = game_state.parse_resource_bar(html)
+
+    assert result["gold"] == 1234567
+    assert result["wood"] == 2500
+    assert result["max_wood"] == 10000
+    assert result["free_transporters"] == 7
+    assert result["upkeep"] == 0
+    assert len(result) == 20
+
+
+def test_fetch_game_state_reads_server_time_from_city_page(fake_session):
+    def on_get(url):
+        if url.startswith("view=city"):
+            return '<li id="servertime" class="x">01.02.2026 10:00:00 CET</li>'
+        if url.startswith("view=updateGlobalData"):
+            return '[["updateGlobalData", {"headerData": {"gold": 5}}]]'
+        return '<li id="servertime">fallback</li>'
+
+    fake_session.on_get = on_get
+
+    state = game_state.fetch_game_state(fake_session, "42")
+    assert state.server_time == "01.02.2026 10:00:00 CET"
+    assert state.gold == 5
+    assert fake_session.gets == ["view=city&cityId=42", "view=updateGlobalData&ajax=1"]
+
+    fake_session.gets.clear()
+    assert game_state.fetch_game_state(fake_session).server_time == "fallback"
+    assert fake_session.gets == ["view=updateGlobalData&ajax=1", ""]
+
+
+def test_parse_global_data_decodes_header_slice_with_braces_in_strings(monkeypatch):
+    header = {"gold": 9, "note": 'a "}{" b \\ }', "relatedCity": {"id": 3}}
+    data = json.dumps([
+        ["updateGlobalData", {"headerData": header, "backgroundData": {"x": "{{{"}}],
+        ["changeView", ["city", "<div>{}</div>" * 50]],
+    ])
+
+    assert game_state._parse_header_data(data) == header
+
+    full_parses = []
+    monkeypatch.setattr(game_state, "fastjson", types.SimpleNamespace(
+        loads=lambda raw: full_parses.append(len(raw)) or fastjson.loads(raw),
+    ))
+    state = game_state.parse_global_data(data)
+    assert (state.gold, state.current_city_id) == (9, "3")
+    assert full_parses == [len(json.dumps(header))]
+
+    # Truncated responses fall back to the full parse (which then fails)
+    assert game_state._parse_header_data(data[:30]) is None
+    assert game_state.parse_global_data(data[:30]).gold == 0
+
+
+def test_parse_header_data_ignores_braces_after_non_object_header():
+    data = json.dumps([["updateGlobalData", {"headerData": None, "backgroundData": {"id": 5}}]])
+    assert game_state._parse_header_data(data) is None
+    assert game_state.parse_global_data(data).raw == {}
+
+    assert game_state._parse_header_data('[["u",{"headerData": \n {"gold": 4}}]]') == {"gold": 4}
+
+
+def test_game_state_uses_slots():
+    state = game_state.GameState()
+    assert not hasattr(state, "__dict__")
+    assert state.resources == [0, 0, 0, 0, 0]
+    with pytest.raises(AttributeError):
+        state.typo_field = 1
+
+
+def test_get_production_per_hour_returns_ints(fake_session):
+    fake_session.on_get = lambda url: (
+        '<a href="?view=tradegood&type=3">'
+        '<td id="js_GlobalMenu_resourceProduction" class="x"> 1,234 </td>'
+        '<td id="js_GlobalMenu_production_crystal">567</td>'
+    )
+
+    result = game_state.getProductionPerHour(fake_session, "1")
+    assert result == (1234, 567, 3)
+    assert all(type(v) is int for v in result)
+
+    fake_session.on_get = lambda url: "<html></html>"
+    assert game_state.getProductionPerHour(fake_session, "1") == (0, 0, 0)
+
+
+def test_resource_bar_and_server_time_accept_raw_bytes():
+    html = (
+        '<li id="servertime" class="x"> 01.02.2026 10:00:00 CET </li>'
+        '<li id="js_GlobalMenu_gold">1,234,567</li>'
+        '<span id="js_GlobalMenu_maxFreighters">3</span>'
+        '<span>Saïd</span>'
+    )
+
+    assert game_state.parse_resource_bar(html.encode("utf-8")) == game_state.parse_resource_bar(html)
+    assert game_state.parse_resource_bar(html.encode("utf-8"))["gold"] == 1234567
+    assert (
+        game_state.parse_server_time(html.encode("utf-8"))
+        == game_state.parse_server_time(html)
+        == "01.02.2026 10:00:00 CET"
+    )
+    assert game_state.parse_server_time(b"<html></html>") == ""
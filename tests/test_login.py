@@ -0,0 +1,47 @@
+
+import pytest
+
+from autoIkabot.core import login as login_mod
+
+
+def test_login_phase_9_stops_streaming_at_split_failure_marker():
+    chunks = [b"<html>nologin_", b"umod", b"never read"]
+    read = []
+
+    class FakeStreamResponse:
+        encoding = "utf-8"
+
+        def iter_content(self, chunk_size):
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+
+        def close(self):
+            pass
+
+    class FakeLinkResponse:
+        status_code = 200
+        reason = "OK"
+        text = ""
+        content = b'{"url": "https://s1-en.ikariam.gameforge.com/index.php?token=x"}'
+
+    class FakeHttpSession:
+        cookies = {"gf-token-production": "tok"}
+
+        def post(self, *args, **kwargs):
+            return FakeLinkResponse()
+
+        def get(self, *args, **kwargs):
+            assert kwargs["stream"] is True
+            return FakeStreamResponse()
+
+    html = login_mod._phase_9_game_cookies(
+        FakeHttpSession(), "UA",
+        {"login_servidor": "en", "mundo": "1", "account_id": "a"},
+        "bb", "host", "url", {},
+    )
+
+    assert html == "<html>nologin_umod"
+    assert read == chunks[:2]
+    with pytest.raises(login_mod.VacationModeError):
+        login_mod._phase_10_validate(html)
@@ -0,0 +1,93 @@
+import gc
+import json
+import types
+
+import pytest
+
+from autoIkabot.helpers import naval
+
+
+def test_ship_counts_share_one_page_fetch_until_invalidated(monkeypatch, fake_session):
+    fake_session.on_get = lambda url: (
+        '<span id="js_GlobalMenu_freeTransporters">4<'
+        '<span id="js_GlobalMenu_freeFreighters">2<'
+    )
+
+    assert naval.getAvailableShips(fake_session) == 4
+    assert naval.getAvailableFreighters(fake_session) == 2
+    assert len(fake_session.gets) == 1
+
+    naval.invalidate_page_cache(fake_session)
+    assert naval.getAvailableShips(fake_session) == 4
+    assert len(fake_session.gets) == 2
+
+    monkeypatch.setattr(naval, "_PAGE_CACHE_TTL", -1.0)
+    naval.getAvailableShips(fake_session)
+    assert len(fake_session.gets) == 3
+
+
+def test_page_cache_is_per_session_and_released_with_it(fake_session):
+    other = type(fake_session)()
+    fake_session.on_get = lambda url: '<span id="js_GlobalMenu_freeTransporters">4<'
+    other.on_get = lambda url: '<span id="js_GlobalMenu_freeTransporters">9<'
+
+    assert naval.getAvailableShips(fake_session) == 4
+    assert naval.getAvailableShips(other) == 9
+    cached = len(naval._page_cache)
+
+    del other
+    gc.collect()
+    assert len(naval._page_cache) == cached - 1
+    assert fake_session in naval._page_cache
+
+
+def test_wait_for_arrival_refetches_page_after_sleeping(monkeypatch, fake_session):
+    pages = iter(["0", "3"])
+    sleeps = []
+
+    def sleep(_session, seconds, interval):
+        sleeps.append(seconds)
+        assert len(sleeps) < 3, "kept re-reading the cached page"
+
+    fake_session.on_get = lambda url: '<span id="js_GlobalMenu_freeTransporters">{}<'.format(next(pages))
+    monkeypatch.setattr(naval, "getMinimumWaitingTime", lambda _s: 5)
+    monkeypatch.setattr(naval, "sleep_with_heartbeat", sleep)
+
+    assert naval.waitForArrival(fake_session) == 3
+    assert sleeps == [5]
+
+
+@pytest.mark.parametrize(
+    "page, expected",
+    [
+        ('{"singleTransporterCapacity":500,"singleFreighterCapacity":50000,"draftEffect":0}', (500, 50000)),
+        ('{"singleTransporterCapacity":625,"singleFreighterCapacity":62500}', (625, 62500)),
+        ('{"singleTransporterCapacity":"x"}', (500, 500)),
+        ("<html></html>", (500, 500)),
+    ],
+)
+def test_get_ship_capacity(fake_session, page, expected):
+    fake_session.on_post = lambda url: page
+
+    assert naval.getShipCapacity(fake_session) == expected
+
+
+def test_get_minimum_waiting_time_uses_earliest_own_movement(monkeypatch, fake_session):
+    movements = [
+        {"isOwnArmyOrFleet": True, "eventTime": "1300"},
+        {"isOwnArmyOrFleet": False, "eventTime": "1010"},
+        {"isOwnArmyOrFleet": True, "eventTime": 1120},
+    ]
+    payload = [
+        ["updateGlobalData", {"time": "1000"}],
+        ["changeView", ["militaryAdvisor", "", {"viewScriptParams": {"militaryAndFleetMovements": movements}}]],
+    ]
+    fake_session.on_get = lambda url: "currentCityId: 5,"
+    fake_session.on_post = lambda url: json.dumps(payload)
+
+    monkeypatch.setattr(naval, "random", types.SimpleNamespace(randint=lambda _a, _b: 7))
+
+    assert naval.getMinimumWaitingTime(fake_session) == 127
+
+    movements[:] = [{"isOwnArmyOrFleet": False, "eventTime": "1010"}]
+    assert naval.getMinimumWaitingTime(fake_session) == 0
@@ -0,0 +1,118 @@
+import types
+
+from autoIkabot.helpers import routing
+
+
+def test_execute_routes_clamps_to_stock_city_space_and_ship_space(monkeypatch, fake_session):
+    cities = {
+        "1": {"id": "1", "availableResources": [1000, 50, 0, 400, 400]},
+        "2": {"id": "2", "freeSpaceForResources": [10000, 10000, 10000, 100, 10000]},
+    }
+    sent = []
+    fake_session.on_get = lambda url: url.split("=")[-1]
+
+    monkeypatch.setattr(routing, "getShipCapacity", lambda _s: (500, 500))
+    monkeypatch.setattr(routing, "waitForArrival", lambda _s, _f: 2)
+    monkeypatch.setattr(routing, "getCity", lambda city_id: cities[city_id])
+    monkeypatch.setattr(
+        routing, "sendGoods",
+        lambda _s, o, d, i, ships, send, f: sent.append((ships, list(send))),
+    )
+
+    routing.executeRoutes(fake_session, [(cities["1"], cities["2"], "9", 900, 100, 0, 300, 0)])
+
+    # 1000 ship space: 900 wood, 50 wine (all in stock), 50 crystal (ships full)
+    assert sent[0] == (2, [900, 50, 0, 50, 0])
+    # 150 resources still round up to a whole ship
+    assert sent[1] == (1, [0, 50, 0, 100, 0])
+
+
+def test_send_goods_backs_off_exponentially_and_resets_when_ships_busy(monkeypatch, fake_session):
+    responses = iter([
+        "garbage",
+        "garbage",
+        '[0, 0, 0, [0, [{"type": 11}]]]',
+        "garbage",
+        '[0, 0, 0, [0, [{"type": 10}]]]',
+    ])
+    sleeps = []
+    fake_session.on_get = lambda url: "currentCityId: 1,"
+    fake_session.on_post = lambda params: (
+        next(responses) if params["function"] == "loadTransportersWithFreight" else ""
+    )
+
+    monkeypatch.setattr(routing, "getCity", lambda _html: {"id": "1", "availableResources": [1, 0, 0, 0, 0]})
+    monkeypatch.setattr(routing, "getMinimumWaitingTime", lambda _s: 42)
+    monkeypatch.setattr(routing, "sleep_with_heartbeat", lambda _s, t: sleeps.append(t))
+    monkeypatch.setattr(routing, "random", types.SimpleNamespace(uniform=lambda _a, _b: 1))
+
+    routing.sendGoods(fake_session, "1", "2", "9", 1, [100, 0, 0, 0, 0])
+
+    # 5s, 10s, then the ships-busy wait resets the back-off to 5s again
+    assert sleeps == [6, 11, 42, 6, 11]
+
+
+def test_send_goods_rereads_current_city_on_every_attempt(monkeypatch, fake_session):
+    responses = iter(["garbage", '[0, 0, 0, [0, [{"type": 10}]]]'])
+    current = iter(["7", "4"])
+    switches = []
+
+    def on_post(params):
+        if params["function"] == "changeCurrentCity":
+            switches.append((params["currentCityId"], params["cityId"]))
+            return ""
+        return next(responses)
+
+    fake_session.on_post = on_post
+    fake_session.on_get = lambda url: f"currentCityId: {next(current)}," if url == "" else url
+    parsed = []
+    monkeypatch.setattr(
+        routing, "getCity",
+        lambda html: parsed.append(html) or {"id": "1", "availableResources": [1, 0, 0, 0, 0]},
+    )
+    monkeypatch.setattr(routing, "sleep_with_heartbeat", lambda _s, _t: None)
+
+    routing.sendGoods(fake_session, "1", "2", "9", 1, [100, 0, 0, 0, 0])
+
+    # Another session moved the account to city 4 between the attempts
+    assert fake_session.gets.count("") == 2
+    assert switches == [("7", "1"), ("4", "1")]
+    # The current-city page is only scanned for its id, never fully parsed
+    assert parsed == [routing.CITY_URL + "1"] * 2
+
+
+def test_send_goods_switches_city_even_when_origin_is_current(monkeypatch, fake_session):
+    fake_session.on_get = lambda url: "currentCityId: 1," if url == "" else url
+    fake_session.on_post = lambda params: '[0, 0, 0, [0, [{"type": 10}]]]'
+    monkeypatch.setattr(routing, "getCity", lambda html: {"id": "1", "availableResources": [1, 0, 0, 0, 0]})
+
+    routing.sendGoods(fake_session, 1, "2", "9", 1, [100, 0, 0, 0, 0])
+
+    assert [params["function"] for params in fake_session.posts] == [
+        "changeCurrentCity", "loadTransportersWithFreight",
+    ]
+
+
+def test_send_goods_rebuilds_cargo_per_attempt_from_shared_base(monkeypatch, fake_session):
+    responses = iter(["garbage", '[0, 0, 0, [0, [{"type": 10}]]]'])
+    stock = iter([[5, 5, 0, 0, 0], [5, 0, 0, 0, 0]])
+    fake_session.on_get = lambda url: "currentCityId: 1," if url == "" else url
+    fake_session.on_post = lambda params: (
+        next(responses) if params["function"] == "loadTransportersWithFreight" else ""
+    )
+
+    monkeypatch.setattr(
+        routing, "getCity",
+        lambda html: {"id": "1", "availableResources": next(stock)},
+    )
+    monkeypatch.setattr(routing, "sleep_with_heartbeat", lambda _s, _t: None)
+
+    routing.sendGoods(fake_session, 1, 2, 9, 3, [100, 50, 0, 0, 0], True)
+
+    first, second = [p for p in fake_session.posts if p["function"] == "loadTransportersWithFreight"]
+    assert first["cargo_tradegood1"] == 50
+    assert "cargo_tradegood1" not in second
+    assert second["cargo_resource"] == 100
+    for data in (first, second):
+        assert (data["currentCityId"], data["destinationCityId"], data["islandId"]) == ("1", "2", "9")
+        assert (data["usedFreightersShips"], data["transporters"]) == (3, "0")
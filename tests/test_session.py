@@ -0,0 +1,52 @@
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+from autoIkabot.web.session import Session
+
+_SESSION_DATA = {
+    "host": "s1-en.ikariam.gameforge.com",
+    "url_base": "https://s1-en.ikariam.gameforge.com/index.php?",
+    "username": "u", "mundo": "1", "servidor": "en", "account_id": "1",
+    "account_group": "", "world_name": "Alpha", "gf_token": "", "blackbox_token": "",
+    "game_headers": {"Host": "s1-en.ikariam.gameforge.com"},
+    "ikariam_cookie": "", "proxies": {}, "account_info": {},
+    "action_request_token": "", "current_city_id": "",
+}
+
+
+def test_child_session_mounts_keepalive_adapter_with_connect_retries():
+    session = Session.from_dict(_SESSION_DATA)
+    adapter = session.s.get_adapter(_SESSION_DATA["url_base"])
+
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.max_retries.connect == 2
+    assert adapter.max_retries.read == 0
+
+
+def test_concurrent_expiry_reports_refresh_the_session_once():
+    session = Session.from_dict(_SESSION_DATA)
+    refreshes = []
+
+    def refresh():
+        refreshes.append(threading.get_ident())
+        time.sleep(0.05)  # keep the other thread waiting on the lock
+
+    session._handle_session_expired = refresh
+    sent_at = time.monotonic()
+    threads = [
+        threading.Thread(target=session._recover_expired_session, args=(sent_at,))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(refreshes) == 1
+
+    # A request sent after that refresh that still finds the session
+    # expired gets a new refresh
+    session._recover_expired_session(time.monotonic())
+    assert len(refreshes) == 2
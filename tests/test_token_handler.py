@@ -0,0 +1,41 @@
+import pytest
+
+from autoIkabot.core import token_handler
+
+
+@pytest.mark.parametrize(
+    "token,expected",
+    [
+        ("tra:JVqc1fosb5TG", True),
+        ("tra:abcdefghij1234", False),   # no uppercase
+        ("tra:ABCDEFGHIJ1234", False),   # no lowercase
+        ("tra:AbcdefGhijKlmn", False),   # no digit
+        ("tra:Ab1", False),              # too short
+        ("JVqc1fosb5TGxx", False),       # missing prefix
+    ],
+)
+def test_validate_blackbox_token(token, expected):
+    assert token_handler._validate_token(token) is expected
+
+
+@pytest.mark.parametrize(
+    "body,expected",
+    [
+        (b'"JVqc1fosb5TGxx"', "tra:JVqc1fosb5TGxx"),
+        (b'{"status": "error", "message": "busy"}', RuntimeError),
+    ],
+)
+def test_fetch_blackbox_token_from_api(monkeypatch, body, expected):
+    class FakeResponse:
+        status_code = 200
+        content = body
+        text = body.decode()
+
+    monkeypatch.setattr(token_handler, "get_api_address", lambda: "http://api")
+    monkeypatch.setattr(token_handler._session, "get", lambda url, **kw: FakeResponse())
+
+    if expected is RuntimeError:
+        with pytest.raises(RuntimeError, match="busy"):
+            token_handler._fetch_from_api("UA")
+    else:
+        assert token_handler._fetch_from_api("UA") == expected